@@ -14,6 +14,7 @@ from datetime import datetime
 
 import structlog
 from crewai import LLM, Crew, Process
+from pydantic import ValidationError
 
 from agents.code_analyzer import create_code_analysis_task, create_code_analyzer_agent
 from agents.test_coverage import create_coverage_analysis_task, create_test_coverage_agent
@@ -27,6 +28,7 @@ from models.analysis import (
     TestCoverageGap,
     TestExecutionPlan,
     TestRecommendation,
+    code_changes_adapter,
 )
 from models.github import PullRequestWebhookPayload
 
@@ -259,9 +261,15 @@ class QualityAnalysisCrew:
         Returns:
             list[CodeChange]: Parsed code changes
         """
-        # For now, create mock data - in production, would parse agent output
-        # The agents should return structured JSON that we can parse
-        logger.warning("using_mock_code_changes", reason="parsing not yet implemented")
+        # Agent output that is already a JSON array of CodeChange objects is
+        # validated in one pass by the precompiled adapter
+        try:
+            return code_changes_adapter.validate_json(str(result))
+        except ValidationError:
+            pass
+
+        # Otherwise fall back to mock data until free-form output parsing lands
+        logger.warning("using_mock_code_changes", reason="agent output is not a JSON array")
 
         return [
             CodeChange(
@@ -382,7 +390,9 @@ class QualityAnalysisCrew:
         else:
             risk_score = "low"
 
-        return AnalysisReport(
+        # Every field comes from the validated webhook payload or validated agent
+        # output, so the report is assembled without a second validation pass
+        return AnalysisReport.model_construct(
             pr_number=webhook_payload.number,
             repository=webhook_payload.repo_full_name,
             pr_url=webhook_payload.pr_url,
@@ -417,7 +427,7 @@ class QualityAnalysisCrew:
         """
         duration = time.time() - start_time
 
-        return AnalysisReport(
+        return AnalysisReport.model_construct(
             pr_number=webhook_payload.number,
             repository=webhook_payload.repo_full_name,
             pr_url=webhook_payload.pr_url,
@@ -456,7 +466,7 @@ class QualityAnalysisCrew:
         """
         duration = time.time() - start_time
 
-        return AnalysisReport(
+        return AnalysisReport.model_construct(
             pr_number=webhook_payload.number,
             repository=webhook_payload.repo_full_name,
             pr_url=webhook_payload.pr_url,
@@ -493,7 +503,7 @@ class QualityAnalysisCrew:
         Returns:
             AnalysisReport: Failed report
         """
-        return AnalysisReport(
+        return AnalysisReport.model_construct(
             pr_number=webhook_payload.number,
             repository=webhook_payload.repo_full_name,
             pr_url=webhook_payload.pr_url,
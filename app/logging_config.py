@@ -9,9 +9,11 @@ This module configures structlog for the application with:
 
 import logging
 import sys
+from collections.abc import Callable
 from typing import Any
 
 import structlog
+from pydantic_core import to_json
 from structlog.types import EventDict, Processor
 
 from app.config import settings
@@ -33,6 +35,22 @@ def add_app_context(logger: Any, method_name: str, event_dict: EventDict) -> Eve
     return event_dict
 
 
+def json_dumps(obj: Any, default: Callable[[Any], Any] | None = None, **_: Any) -> str:
+    """Serialize a log event with pydantic-core's native JSON encoder.
+
+    Drop-in serializer for structlog's JSONRenderer, which passes its fallback
+    handler for unknown types as ``default``.
+
+    Args:
+        obj: The event dictionary to serialize
+        default: Fallback for values the encoder cannot handle natively
+
+    Returns:
+        JSON string for the log line
+    """
+    return to_json(obj, fallback=default).decode("utf-8")
+
+
 def configure_logging() -> None:
     """Configure structured logging for the application.
 
@@ -61,7 +79,6 @@ def configure_logging() -> None:
         # structlog.stdlib.add_logger_name,
         structlog.processors.TimeStamper(fmt="iso"),
         add_app_context,
-        structlog.processors.StackInfoRenderer(),
     ]
 
     # Environment-specific processors
@@ -69,7 +86,7 @@ def configure_logging() -> None:
         # Production: JSON output for log aggregation (e.g., CloudWatch, Datadog)
         processors: list[Processor] = shared_processors + [
             structlog.processors.format_exc_info,
-            structlog.processors.JSONRenderer(),
+            structlog.processors.JSONRenderer(serializer=json_dumps),
         ]
     else:
         # Development: Pretty console output with colors
@@ -17,7 +17,7 @@ from prometheus_fastapi_instrumentator import Instrumentator
 
 from app.config import settings
 from app.logging_config import configure_logging, get_logger
-from app.webhook_audit import cleanup_old_audit_logs
+from app.webhook_audit import cleanup_old_audit_logs, close_audit_log
 from app.webhook_receiver import handle_github_webhook
 
 
@@ -53,25 +53,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None]:
         if deleted_count > 0:
             logger.info("audit_logs_cleaned", deleted_count=deleted_count)
 
-    # Enable Prometheus metrics if configured
     if settings.enable_metrics:
-        instrumentator = Instrumentator(
-            should_group_status_codes=True,
-            should_ignore_untemplated=True,
-            should_respect_env_var=False,
-            should_instrument_requests_inprogress=True,
-            excluded_handlers=["/health", "/metrics"],  # Don't track these endpoints
-            inprogress_name="http_requests_inprogress",
-            inprogress_labels=True,
-        )
-
-        # Instrument the app and expose /metrics endpoint
-        if settings.metrics_include_default:
-            instrumentator.instrument(app).expose(app, endpoint="/metrics")
-        else:
-            # Only expose DORA metrics, skip default HTTP metrics
-            instrumentator.expose(app, endpoint="/metrics")
-
         logger.info(
             "metrics_enabled",
             endpoint="/metrics",
@@ -81,6 +63,7 @@ async def lifespan(app: FastAPI) -> AsyncGenerator[None]:
     yield
 
     # Shutdown
+    close_audit_log()
     logger.info("application_shutdown")
 
 
@@ -103,6 +86,26 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Enable Prometheus metrics if configured. This adds middleware, which must
+# happen before the app starts, so it can't run in the lifespan.
+if settings.enable_metrics:
+    instrumentator = Instrumentator(
+        should_group_status_codes=True,
+        should_ignore_untemplated=True,
+        should_respect_env_var=False,
+        should_instrument_requests_inprogress=True,
+        excluded_handlers=["/health", "/metrics"],  # Don't track these endpoints
+        inprogress_name="http_requests_inprogress",
+        inprogress_labels=True,
+    )
+
+    # Instrument the app and expose /metrics endpoint
+    if settings.metrics_include_default:
+        instrumentator.instrument(app).expose(app, endpoint="/metrics")
+    else:
+        # Only expose DORA metrics, skip default HTTP metrics
+        instrumentator.expose(app, endpoint="/metrics")
+
 
 @app.exception_handler(Exception)
 async def global_exception_handler(request: Request, exc: Exception) -> JSONResponse:
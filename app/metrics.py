@@ -150,9 +150,8 @@ def record_pr_event(repository: str, action: str, merged: bool) -> None:
         action: PR action (opened, closed, synchronize)
         merged: Whether the PR was merged (True/False)
     """
-    pr_total.labels(
-        repository=repository, action=action, merged=str(merged).lower()
-    ).inc()
+    # Positional label values (in declaration order) skip the kwargs mapping
+    pr_total.labels(repository, action, "true" if merged else "false").inc()
 
 
 def record_pr_review_time(repository: str, review_time_seconds: float) -> None:
@@ -162,7 +161,7 @@ def record_pr_review_time(repository: str, review_time_seconds: float) -> None:
         repository: Repository full name
         review_time_seconds: Time in seconds from PR creation to merge
     """
-    pr_review_time_seconds.labels(repository=repository).observe(review_time_seconds)
+    pr_review_time_seconds.labels(repository).observe(review_time_seconds)
 
 
 def record_deployment(
@@ -179,9 +178,7 @@ def record_deployment(
         success: Whether deployment succeeded (default: True)
     """
     status = "success" if success else "failure"
-    deployments_total.labels(
-        repository=repository, environment=environment, status=status
-    ).inc()
+    deployments_total.labels(repository, environment, status).inc()
 
 
 def record_incident_recovery(
@@ -196,6 +193,6 @@ def record_incident_recovery(
         incident_type: Type of incident (deployment_failure, hotfix, rollback)
         recovery_time_seconds: Time to restore service in seconds
     """
-    incident_recovery_time_seconds.labels(
-        repository=repository, incident_type=incident_type
-    ).observe(recovery_time_seconds)
+    incident_recovery_time_seconds.labels(repository, incident_type).observe(
+        recovery_time_seconds
+    )
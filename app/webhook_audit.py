@@ -7,21 +7,46 @@ processing and replay.
 Features:
 - Daily log rotation (one file per day)
 - Automatic cleanup of old logs based on retention policy
-- Thread-safe writing for concurrent webhook requests
+- Thread-safe writing for concurrent webhook requests (one open handle per day)
 - Complete request capture (headers, payload, metadata)
 """
 
 import json
-from datetime import date, datetime, timedelta
+import threading
+from datetime import UTC, date, datetime, timedelta
 from pathlib import Path
-from typing import Any
+from typing import Any, TextIO
 
 import structlog
 
 from app.config import settings
 
+
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional; the stdlib parser accepts bytes too
+    from json import loads as json_loads
+
 logger = structlog.get_logger()
 
+# Raw body content that can't be spliced into an audit line verbatim: line
+# breaks would split the one-entry-per-line format (universal-newline readers
+# also split on a bare "\r"), and the NaN/Infinity constants that pydantic
+# accepts are rejected by strict JSON parsers such as orjson
+_UNSPLICEABLE = (b"\n", b"\r", b"NaN", b"Infinity")
+
+
+def _needs_reencoding(body: bytes) -> bool:
+    """Check whether a raw JSON body must be re-encoded before it is logged.
+
+    Args:
+        body: Raw JSON request body
+
+    Returns:
+        bool: True if the body can't be written into an audit line as-is
+    """
+    return any(token in body for token in _UNSPLICEABLE)
+
 
 class WebhookAuditor:
     """Handles audit logging of webhook requests.
@@ -62,6 +87,14 @@ class WebhookAuditor:
         self.retention_days = retention_days or settings.webhook_audit_retention_days
         self.enabled = settings.enable_webhook_audit
 
+        # Today's log file, rebuilt only when the date rolls over
+        self._log_file_cache: tuple[date, Path] | None = None
+
+        # Append handle kept open across requests; writes are serialized by the
+        # lock since requests are audited from worker threads
+        self._write_lock = threading.Lock()
+        self._handle: tuple[Path, TextIO] | None = None
+
         # Create audit directory if it doesn't exist
         if self.enabled:
             self.audit_dir.mkdir(parents=True, exist_ok=True)
@@ -76,8 +109,9 @@ class WebhookAuditor:
         delivery_id: str,
         event_type: str,
         headers: dict[str, str],
-        payload: dict[str, Any],
+        payload: dict[str, Any] | bytes,
         metadata: dict[str, Any] | None = None,
+        received_at: datetime | None = None,
     ) -> None:
         """Log a webhook request to the audit log.
 
@@ -85,27 +119,46 @@ class WebhookAuditor:
             delivery_id: GitHub delivery ID (X-GitHub-Delivery)
             event_type: GitHub event type (X-GitHub-Event)
             headers: All request headers
-            payload: Request payload (JSON body)
+            payload: Request payload, either parsed or as the raw JSON body bytes
+                (raw bodies are written verbatim instead of being re-serialized)
             metadata: Optional additional metadata (e.g., pr_number, action)
+            received_at: UTC time the request was received (default: now)
         """
         if not self.enabled:
             return
 
         try:
+            # One clock read drives both the entry timestamp and the file name;
+            # aware times are normalized to naive UTC so the "Z" suffix holds
+            now = received_at or datetime.utcnow()
+            if now.tzinfo is not None:
+                now = now.astimezone(UTC).replace(tzinfo=None)
+
             # Create audit entry
             audit_entry = {
-                "timestamp": datetime.utcnow().isoformat() + "Z",
+                "timestamp": now.isoformat() + "Z",
                 "delivery_id": delivery_id,
                 "event_type": event_type,
                 "headers": headers,
-                "payload": payload,
                 "metadata": metadata or {},
             }
 
-            # Write to daily log file (one file per day)
-            log_file = self._get_log_file()
-            with log_file.open("a", encoding="utf-8") as f:
-                f.write(json.dumps(audit_entry) + "\n")
+            if isinstance(payload, bytes) and not _needs_reencoding(payload):
+                # Splice the already-valid JSON body in as-is
+                line = f'{json.dumps(audit_entry)[:-1]}, "payload": {payload.decode("utf-8")}}}'
+            else:
+                if isinstance(payload, bytes):
+                    # NaN/Infinity become null, as strict JSON readers expect
+                    payload = json.loads(payload, parse_constant=lambda _: None)
+                line = json.dumps({**audit_entry, "payload": payload})
+
+            # Write to daily log file (one file per day), flushing each entry
+            # so it is visible to readers as soon as the request completes
+            log_file = self._get_log_file(now.date())
+            with self._write_lock:
+                f = self._get_handle(log_file)
+                f.write(line + "\n")
+                f.flush()
 
             logger.debug(
                 "webhook_audited",
@@ -122,15 +175,45 @@ class WebhookAuditor:
                 error=str(e),
             )
 
-    def _get_log_file(self) -> Path:
+    def _get_log_file(self, today: date | None = None) -> Path:
         """Get the log file for today.
 
+        Args:
+            today: Current UTC date, if the caller already has it (default: now)
+
         Returns:
             Path: Path to today's audit log file (e.g., webhooks-2025-11-15.jsonl)
         """
-        today = datetime.utcnow().date()
-        filename = f"webhooks-{today.isoformat()}.jsonl"
-        return self.audit_dir / filename
+        today = today or datetime.utcnow().date()
+        if self._log_file_cache is None or self._log_file_cache[0] != today:
+            filename = f"webhooks-{today.isoformat()}.jsonl"
+            self._log_file_cache = (today, self.audit_dir / filename)
+        return self._log_file_cache[1]
+
+    def _get_handle(self, log_file: Path) -> TextIO:
+        """Get the open append handle for a log file.
+
+        Must be called with the write lock held. The previous day's handle is
+        closed when the log file changes.
+
+        Args:
+            log_file: Path of the log file being written
+
+        Returns:
+            TextIO: Open append handle for log_file
+        """
+        if self._handle is None or self._handle[0] != log_file:
+            if self._handle is not None:
+                self._handle[1].close()
+            self._handle = (log_file, log_file.open("a", encoding="utf-8"))
+        return self._handle[1]
+
+    def close(self) -> None:
+        """Close the open audit log handle, if any."""
+        with self._write_lock:
+            if self._handle is not None:
+                self._handle[1].close()
+                self._handle = None
 
     def cleanup_old_logs(self) -> int:
         """Remove audit logs older than retention period.
@@ -184,6 +267,9 @@ class WebhookAuditor:
     def read_audit_logs(self, target_date: date | None = None) -> list[dict[str, Any]]:
         """Read audit logs for a specific date.
 
+        Lines that are not valid UTF-8 JSON (e.g. an entry truncated by a crash
+        mid-write) are skipped with a warning rather than failing the read.
+
         Args:
             target_date: Date to read logs for (default: today)
 
@@ -202,10 +288,22 @@ class WebhookAuditor:
 
         entries = []
         try:
-            with log_file.open("r", encoding="utf-8") as f:
-                for line in f:
-                    if line.strip():
-                        entries.append(json.loads(line))
+            # The parser decodes UTF-8 itself, so lines are handed over as raw bytes
+            with log_file.open("rb") as f:
+                for line_number, line in enumerate(f, start=1):
+                    if line.isspace():
+                        continue
+                    try:
+                        entries.append(json_loads(line))
+                    except ValueError as e:
+                        # Covers JSONDecodeError from either parser and
+                        # UnicodeDecodeError from the stdlib one
+                        logger.warning(
+                            "audit_log_line_invalid",
+                            file=str(log_file),
+                            line_number=line_number,
+                            error=str(e),
+                        )
         except Exception as e:
             logger.error(
                 "audit_log_read_failed",
@@ -234,16 +332,24 @@ class WebhookAuditor:
 # Global auditor instance
 _auditor: WebhookAuditor | None = None
 
+# Guards creation of the global auditor; requests are audited from worker
+# threads, and two auditors would each hold their own handle and write lock
+_auditor_lock = threading.Lock()
+
 
 def get_auditor() -> WebhookAuditor:
     """Get the global webhook auditor instance.
 
+    Thread-safe: concurrent first calls create a single auditor.
+
     Returns:
         WebhookAuditor: Global auditor instance
     """
     global _auditor
     if _auditor is None:
-        _auditor = WebhookAuditor()
+        with _auditor_lock:
+            if _auditor is None:
+                _auditor = WebhookAuditor()
     return _auditor
 
 
@@ -251,8 +357,9 @@ def log_webhook(
     delivery_id: str,
     event_type: str,
     headers: dict[str, str],
-    payload: dict[str, Any],
+    payload: dict[str, Any] | bytes,
     metadata: dict[str, Any] | None = None,
+    received_at: datetime | None = None,
 ) -> None:
     """Convenience function to log a webhook request.
 
@@ -260,11 +367,14 @@ def log_webhook(
         delivery_id: GitHub delivery ID
         event_type: GitHub event type
         headers: Request headers
-        payload: Request payload
+        payload: Request payload (parsed, or raw JSON body bytes)
         metadata: Optional metadata
+        received_at: UTC time the request was received (default: now)
     """
     auditor = get_auditor()
-    auditor.log_webhook_request(delivery_id, event_type, headers, payload, metadata)
+    auditor.log_webhook_request(
+        delivery_id, event_type, headers, payload, metadata, received_at
+    )
 
 
 def cleanup_old_audit_logs() -> int:
@@ -275,3 +385,9 @@ def cleanup_old_audit_logs() -> int:
     """
     auditor = get_auditor()
     return auditor.cleanup_old_logs()
+
+
+def close_audit_log() -> None:
+    """Convenience function to close the global auditor's open log file."""
+    if _auditor is not None:
+        _auditor.close()
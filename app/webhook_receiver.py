@@ -11,11 +11,14 @@ Security:
 Reference: https://docs.github.com/en/webhooks/using-webhooks/validating-webhook-deliveries
 """
 
+import asyncio
 import hashlib
 import hmac
+from functools import lru_cache
 
 import structlog
 from fastapi import BackgroundTasks, HTTPException, Request, status
+from pydantic import ValidationError
 
 from agents import analyze_pull_request
 from app.config import settings
@@ -26,6 +29,12 @@ from models.github import PullRequestWebhookPayload, PushWebhookPayload, Webhook
 
 logger = structlog.get_logger(__name__)
 
+# Payload model for each handled GitHub event type
+_PAYLOAD_MODELS: dict[str, type[PullRequestWebhookPayload] | type[PushWebhookPayload]] = {
+    "pull_request": PullRequestWebhookPayload,
+    "push": PushWebhookPayload,
+}
+
 
 class WebhookVerificationError(Exception):
     """Raised when webhook signature verification fails."""
@@ -70,26 +79,32 @@ def verify_github_signature(
     # Extract hash from header (remove "sha256=" prefix)
     received_signature = signature_header[7:]
 
-    # Compute expected signature
-    expected_signature = hmac.new(
-        key=secret.encode("utf-8"),
-        msg=payload_body,
-        digestmod=hashlib.sha256,
-    ).hexdigest()
+    # Compare raw 32-byte digests rather than 64-char hex strings
+    mac = hmac.new(key=_secret_key(secret), msg=payload_body, digestmod=hashlib.sha256)
+    try:
+        received_digest = bytes.fromhex(received_signature)
+    except ValueError:
+        received_digest = b""
 
     # Constant-time comparison to prevent timing attacks
-    is_valid = hmac.compare_digest(received_signature, expected_signature)
+    is_valid = hmac.compare_digest(mac.digest(), received_digest)
 
     if not is_valid:
         logger.warning(
             "signature_verification_failed",
             received=received_signature[:16] + "...",  # Log partial hash
-            expected=expected_signature[:16] + "...",
+            expected=mac.hexdigest()[:16] + "...",
         )
 
     return is_valid
 
 
+@lru_cache(maxsize=4)
+def _secret_key(secret: str) -> bytes:
+    """Encode the webhook secret once instead of on every request."""
+    return secret.encode("utf-8")
+
+
 async def run_pr_analysis(
     payload: PullRequestWebhookPayload,
     delivery_id: str,
@@ -131,8 +146,7 @@ async def run_pr_analysis(
         )
 
         # Log summary for easy viewing
-        summary = report.to_summary_dict()
-        logger.info("analysis_summary", **summary)
+        logger.info("analysis_summary", **report.summary.model_dump())
 
         # TODO: Phase 4 - Store results in database
         # TODO: Phase 5 - Post results as PR comment or webhook callback
@@ -380,7 +394,7 @@ async def handle_github_webhook(
         It should not be called directly in application code.
     """
     # Only handle pull_request and push events
-    if x_github_event not in ("pull_request", "push"):
+    if x_github_event not in _PAYLOAD_MODELS:
         logger.info(
             "webhook_ignored",
             event_type=x_github_event,
@@ -414,15 +428,21 @@ async def handle_github_webhook(
             detail="Invalid webhook signature",
         )
 
-    # Parse JSON payload
+    # Parse and validate the payload in a single pass over the raw bytes, with
+    # no intermediate dict. Bodies that are not JSON at all are rejected before
+    # auditing; schema mismatches are audited first and rejected below.
+    payload_model = _PAYLOAD_MODELS[x_github_event]
+    validation_error: ValidationError | None = None
     try:
-        payload_json = await request.json()
-    except Exception as e:
-        logger.error("webhook_rejected", reason="Invalid JSON", error=str(e))
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail="Invalid JSON payload",
-        )
+        payload = payload_model.model_validate_json(payload_body)
+    except ValidationError as e:
+        if any(error["type"] == "json_invalid" for error in e.errors()):
+            logger.error("webhook_rejected", reason="Invalid JSON", error=str(e))
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Invalid JSON payload",
+            )
+        validation_error = e
 
     # Create delivery info for tracking
     delivery_info = WebhookDeliveryInfo(
@@ -432,63 +452,46 @@ async def handle_github_webhook(
         payload_size=len(payload_body),
     )
 
-    # Audit log the webhook request (for replay and debugging)
-    log_webhook(
-        delivery_id=x_github_delivery,
-        event_type=x_github_event,
-        headers={
-            "X-GitHub-Event": x_github_event,
-            "X-GitHub-Delivery": x_github_delivery,
-            "X-Hub-Signature-256": x_hub_signature_256,
-            "Content-Type": request.headers.get("Content-Type", ""),
-            "User-Agent": request.headers.get("User-Agent", ""),
-        },
-        payload=payload_json,
-        metadata={
-            "payload_size": len(payload_body),
-            "timestamp": delivery_info.received_at.isoformat(),
-        },
+    # Audit log the webhook request (for replay and debugging). The file write
+    # runs on a worker thread while the webhook is processed, and is awaited
+    # before responding whether or not processing succeeds.
+    audit_write = asyncio.create_task(
+        asyncio.to_thread(
+            log_webhook,
+            delivery_id=x_github_delivery,
+            event_type=x_github_event,
+            headers={
+                "X-GitHub-Event": x_github_event,
+                "X-GitHub-Delivery": x_github_delivery,
+                "X-Hub-Signature-256": x_hub_signature_256,
+                "Content-Type": request.headers.get("Content-Type", ""),
+                "User-Agent": request.headers.get("User-Agent", ""),
+            },
+            payload=payload_body,
+            metadata={
+                "payload_size": len(payload_body),
+                "timestamp": delivery_info.received_at.isoformat(),
+            },
+            received_at=delivery_info.received_at,
+        )
     )
 
-    # Route to appropriate handler based on event type
-    if x_github_event == "pull_request":
-        # Validate payload structure with Pydantic
-        try:
-            payload = PullRequestWebhookPayload.model_validate(payload_json)
-        except Exception as e:
-            logger.error(
-                "webhook_rejected",
-                reason="Invalid pull_request payload structure",
-                error=str(e),
-                delivery_id=x_github_delivery,
-            )
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid payload structure: {str(e)}",
-            )
-
-        return await process_pull_request_webhook(payload, delivery_info, background_tasks)
-
-    if x_github_event == "push":
-        # Validate payload structure with Pydantic
-        try:
-            payload = PushWebhookPayload.model_validate(payload_json)
-        except Exception as e:
+    try:
+        if validation_error is not None:
             logger.error(
                 "webhook_rejected",
-                reason="Invalid push payload structure",
-                error=str(e),
+                reason=f"Invalid {x_github_event} payload structure",
+                error=str(validation_error),
                 delivery_id=x_github_delivery,
             )
             raise HTTPException(
                 status_code=status.HTTP_400_BAD_REQUEST,
-                detail=f"Invalid payload structure: {str(e)}",
+                detail=f"Invalid payload structure: {str(validation_error)}",
             )
 
+        # Route to appropriate handler based on event type
+        if isinstance(payload, PullRequestWebhookPayload):
+            return await process_pull_request_webhook(payload, delivery_info, background_tasks)
         return await process_push_webhook(payload, delivery_info)
-
-    # Should never reach here due to earlier check, but for safety
-    return {
-        "status": "ignored",
-        "message": f"Event type '{x_github_event}' is not handled",
-    }
+    finally:
+        await audit_write
@@ -2,6 +2,7 @@
 
 from models.analysis import (
     AnalysisReport,
+    AnalysisReportSummary,
     ChangeType,
     CodeChange,
     FileType,
@@ -41,6 +42,7 @@ __all__ = [
     "WebhookDeliveryInfo",
     # Analysis models
     "AnalysisReport",
+    "AnalysisReportSummary",
     "ChangeType",
     "CodeChange",
     "FileType",
@@ -13,7 +13,7 @@ from datetime import datetime
 from enum import Enum
 from typing import Literal
 
-from pydantic import BaseModel, ConfigDict, Field
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 
 
 class ChangeType(str, Enum):
@@ -120,6 +120,12 @@ class CodeChange(BaseModel):
         return self.file_type == FileType.SOURCE
 
 
+# Precompiled validator for CodeAnalyzerAgent output. validate_json() parses and
+# validates a JSON array of code changes in a single pydantic-core pass, without
+# building intermediate dicts or re-walking the schema for every PR.
+code_changes_adapter: TypeAdapter[list[CodeChange]] = TypeAdapter(list[CodeChange])
+
+
 class TestCoverageGap(BaseModel):
     """Represents a test coverage gap identified by TestCoverageAgent.
 
@@ -346,6 +352,37 @@ class TestExecutionPlan(BaseModel):
         return len(self.critical_tests) > 0
 
 
+class AnalysisReportSummary(BaseModel):
+    """Concise summary of an AnalysisReport for API responses or logging.
+
+    Example:
+        ```python
+        logger.info("analysis_summary", **report.summary.model_dump())
+        ```
+    """
+
+    model_config = ConfigDict(frozen=True)
+
+    pr_number: int = Field(description="Pull request number")
+    repository: str = Field(description="Repository full name (owner/repo)")
+    status: Literal["completed", "partial", "failed"] = Field(
+        description="Analysis completion status"
+    )
+    total_changes: int = Field(ge=0, description="Total code changes identified")
+    source_files_changed: int = Field(ge=0, description="Source files changed")
+    test_files_changed: int = Field(ge=0, description="Test files changed")
+    coverage_gaps: int = Field(ge=0, description="Coverage gaps identified")
+    critical_gaps: int = Field(ge=0, description="Critical coverage gaps")
+    total_test_recommendations: int = Field(ge=0, description="Tests recommended")
+    critical_tests: int = Field(ge=0, description="Critical tests recommended")
+    risk_score: Literal["low", "medium", "high", "critical"] | None = Field(
+        default=None, description="Overall risk score for this PR"
+    )
+    duration_seconds: float | None = Field(
+        default=None, description="How long analysis took"
+    )
+
+
 class AnalysisReport(BaseModel):
     """Final analysis report combining all agent outputs.
 
@@ -457,23 +494,27 @@ class AnalysisReport(BaseModel):
         """
         return [change for change in self.code_changes if change.is_test_file]
 
-    def to_summary_dict(self) -> dict:
-        """Create a concise summary dict for API responses or logging.
+    @property
+    def summary(self) -> AnalysisReportSummary:
+        """Concise summary of key metrics and results.
+
+        Built with model_construct() since every field is derived from this
+        already-validated report.
 
         Returns:
-            dict: Summary of key metrics and results.
+            AnalysisReportSummary: Summary for API responses or logging.
         """
-        return {
-            "pr_number": self.pr_number,
-            "repository": self.repository,
-            "status": self.status,
-            "total_changes": len(self.code_changes),
-            "source_files_changed": len(self.source_files_changed),
-            "test_files_changed": len(self.test_files_changed),
-            "coverage_gaps": len(self.coverage_gaps),
-            "critical_gaps": len([g for g in self.coverage_gaps if g.is_critical]),
-            "total_test_recommendations": self.test_plan.total_tests,
-            "critical_tests": len(self.test_plan.critical_tests),
-            "risk_score": self.risk_score,
-            "duration_seconds": self.duration_seconds,
-        }
+        return AnalysisReportSummary.model_construct(
+            pr_number=self.pr_number,
+            repository=self.repository,
+            status=self.status,
+            total_changes=len(self.code_changes),
+            source_files_changed=len(self.source_files_changed),
+            test_files_changed=len(self.test_files_changed),
+            coverage_gaps=len(self.coverage_gaps),
+            critical_gaps=sum(1 for gap in self.coverage_gaps if gap.is_critical),
+            total_test_recommendations=self.test_plan.total_tests,
+            critical_tests=len(self.test_plan.critical_tests),
+            risk_score=self.risk_score,
+            duration_seconds=self.duration_seconds,
+        )
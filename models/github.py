@@ -178,7 +178,7 @@ class PushWebhookPayload(BaseModel):
     Example:
         ```python
         payload = PushWebhookPayload.model_validate(request_json)
-        branch = payload.ref.split('/')[-1]  # Extract branch name
+        branch = payload.branch_name  # e.g. "feature/login"
         commits = payload.commits
         ```
     """
@@ -198,9 +198,10 @@ class PushWebhookPayload(BaseModel):
         """Extract branch name from ref.
 
         Returns:
-            str: Branch name (e.g., "main" from "refs/heads/main")
+            str: Branch name (e.g., "main" from "refs/heads/main", or
+                "feature/login" from "refs/heads/feature/login")
         """
-        return self.ref.split("/")[-1]
+        return self.ref.removeprefix("refs/heads/")
 
     @property
     def is_branch_push(self) -> bool:
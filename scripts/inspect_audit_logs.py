@@ -23,18 +23,87 @@ Usage:
 
 import argparse
 import json
+from collections.abc import Callable, Iterator, Mapping
 from datetime import date, datetime
 from pathlib import Path
+from types import MappingProxyType
 from typing import Any
 
+from rich.columns import Columns
 from rich.console import Console
 from rich.json import JSON
 from rich.panel import Panel
 from rich.table import Table
 from rich.tree import Tree
 
+try:
+    from orjson import loads as json_loads
+except ImportError:  # orjson is optional; the stdlib parser accepts bytes too
+    from json import loads as json_loads
+
 console = Console()
 
+# Read size for streaming JSONL audit logs
+_CHUNK_SIZE = 1 << 20
+
+# Single-character ellipsis for truncated display values
+_ELLIPSIS = "…"
+
+# Signature headers (lowercase, compared case-insensitively) whose long values
+# get truncated for display
+_SIGNATURE_HEADERS = frozenset({"x-hub-signature", "x-hub-signature-256"})
+
+# Header count above which headers are shown as columns rather than a table
+_MAX_HEADER_TABLE_ROWS = 50
+
+# Shared read-only stand-in for missing nested objects (no throwaway dicts)
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+
+def _dig(data: Mapping[str, Any], *keys: str, default: Any = None) -> Any:
+    """Look up a nested key path, returning default if any level is missing.
+
+    Args:
+        data: Mapping to start from
+        *keys: Key path to follow (e.g., "repository", "full_name")
+        default: Value returned when the path does not exist
+
+    Returns:
+        The value at the key path, or default
+    """
+    for key in keys:
+        data = data.get(key, _EMPTY)
+        if data is _EMPTY:
+            return default
+    return data
+
+
+def _iter_jsonl_lines(log_file: Path) -> Iterator[tuple[int, bytes]]:
+    """Yield raw lines from a JSONL file without text-mode decoding.
+
+    Reads fixed-size binary chunks and carves complete lines out of a buffer
+    that carries the partial last line over to the next chunk.
+
+    Args:
+        log_file: Path to the JSONL file
+
+    Yields:
+        Tuples of (1-based line number, line bytes without the newline)
+    """
+    line_num = 0
+    tail = bytearray()
+    with open(log_file, "rb", buffering=0) as f:
+        while chunk := f.read(_CHUNK_SIZE):
+            tail += chunk
+            start = 0
+            while (nl := tail.find(b"\n", start)) != -1:
+                line_num += 1
+                yield line_num, bytes(tail[start:nl])
+                start = nl + 1
+            del tail[:start]
+    if tail:
+        yield line_num + 1, bytes(tail)
+
 
 def load_audit_logs(date_str: str) -> list[dict[str, Any]]:
     """Load audit logs for a specific date.
@@ -53,16 +122,16 @@ def load_audit_logs(date_str: str) -> list[dict[str, Any]]:
         return []
 
     entries = []
-    with open(log_file) as f:
-        for line_num, line in enumerate(f, 1):
-            if line.strip():
-                try:
-                    entries.append(json.loads(line))
-                except json.JSONDecodeError as e:
-                    console.print(
-                        f"[red]Error parsing line {line_num}: {e}[/red]", style="dim"
-                    )
-                    continue
+    # The parser decodes UTF-8 itself, so lines are handed over as raw bytes
+    for line_num, line in _iter_jsonl_lines(log_file):
+        if not line or line.isspace():
+            continue
+        try:
+            entries.append(json_loads(line))
+        except ValueError as e:
+            # Covers JSONDecodeError from either parser and UnicodeDecodeError
+            # from the stdlib one
+            console.print(f"[red]Error parsing line {line_num}: {e}[/red]", style="dim")
 
     return entries
 
@@ -85,20 +154,32 @@ def create_summary_table(entries: list[dict[str, Any]]) -> Table:
     table.add_column("PR/Ref", style="blue")
     table.add_column("Delivery ID", style="dim", no_wrap=True)
 
+    # Bind hot-loop callables locally
+    add_row = table.add_row
+    fromisoformat = datetime.fromisoformat
+
     for entry in entries:
-        timestamp = entry.get("metadata", {}).get("timestamp", "N/A")
-        # Parse and format timestamp
-        if timestamp != "N/A":
+        timestamp = _dig(entry, "metadata", "timestamp", default="N/A")
+        # ISO timestamps (YYYY-MM-DDTHH:MM:SS...) already hold the display time
+        if (
+            isinstance(timestamp, str)
+            and len(timestamp) >= 19
+            and timestamp[10] == "T"
+            and timestamp[13] == ":"
+        ):
+            timestamp = timestamp[11:19]
+        # Otherwise parse and format timestamp
+        elif timestamp != "N/A":
             try:
-                dt = datetime.fromisoformat(timestamp.replace("Z", "+00:00"))
+                dt = fromisoformat(timestamp.replace("Z", "+00:00"))
                 timestamp = dt.strftime("%H:%M:%S")
             except (ValueError, AttributeError):
                 pass
 
         event_type = entry.get("event_type", "N/A")
-        payload = entry.get("payload", {})
+        payload = entry.get("payload") or _EMPTY
         action = payload.get("action", "N/A")
-        repo = payload.get("repository", {}).get("full_name", "N/A")
+        repo = _dig(payload, "repository", "full_name", default="N/A")
 
         # Get PR number or ref depending on event type
         if event_type == "pull_request":
@@ -112,9 +193,9 @@ def create_summary_table(entries: list[dict[str, Any]]) -> Table:
         delivery_id = entry.get("delivery_id", "N/A")
         # Truncate delivery ID for display
         if len(delivery_id) > 36:
-            delivery_id = delivery_id[:8] + "..."
+            delivery_id = delivery_id[:8] + _ELLIPSIS
 
-        table.add_row(timestamp, event_type, action, repo, pr_ref, delivery_id)
+        add_row(timestamp, event_type, action, repo, pr_ref, delivery_id)
 
     return table
 
@@ -209,17 +290,25 @@ def show_webhook_detail(entry: dict[str, Any], verbose: bool = False) -> None:
     # Headers
     if headers:
         console.print("\n[bold underline]Headers:[/bold underline]")
-        headers_table = Table(show_header=True, box=None)
-        headers_table.add_column("Header", style="cyan")
-        headers_table.add_column("Value", style="white")
 
+        rows = []
         for key, value in sorted(headers.items()):
             # Truncate signature for display
-            if "signature" in key.lower() and len(str(value)) > 50:
-                value = str(value)[:50] + "..."
-            headers_table.add_row(key, str(value))
-
-        console.print(headers_table)
+            value = str(value)
+            if key.lower() in _SIGNATURE_HEADERS and len(value) > 50:
+                value = value[:50] + _ELLIPSIS
+            rows.append((key, value))
+
+        if len(rows) > _MAX_HEADER_TABLE_ROWS:
+            # Flow very large header sets into columns instead of measuring a table
+            console.print(Columns(f"[cyan]{key}[/cyan] {value}" for key, value in rows))
+        else:
+            headers_table = Table(show_header=True, box=None, collapse_padding=True)
+            headers_table.add_column("Header", style="cyan")
+            headers_table.add_column("Value", style="white")
+            for row in rows:
+                headers_table.add_row(*row)
+            console.print(headers_table)
 
     # Full payload if verbose
     if verbose:
@@ -270,27 +359,32 @@ def main() -> None:
     if not entries:
         return
 
-    # Filter entries
+    # Filter entries in a single pass over all active filters
+    predicates: list[Callable[[dict[str, Any]], bool]] = []
     if args.event:
-        entries = [e for e in entries if e.get("event_type") == args.event]
+        event = args.event
+        predicates.append(lambda e: e.get("event_type") == event)
 
     if args.repo:
-        entries = [
-            e
-            for e in entries
-            if e.get("payload", {}).get("repository", {}).get("full_name") == args.repo
-        ]
+        repo = args.repo
+        predicates.append(lambda e: _dig(e, "payload", "repository", "full_name") == repo)
+
+    if len(predicates) == 1:
+        entries = list(filter(predicates[0], entries))
+    elif predicates:
+        entries = [e for e in entries if all(p(e) for p in predicates)]
 
     if args.delivery_id:
-        # Show detail for specific delivery
-        matching = [e for e in entries if e.get("delivery_id") == args.delivery_id]
-        if not matching:
+        # Show detail for specific delivery (stops at the first match)
+        delivery_id = args.delivery_id
+        match = next((e for e in entries if e.get("delivery_id") == delivery_id), None)
+        if match is None:
             console.print(
                 f"[red]No webhook found with delivery ID: {args.delivery_id}[/red]"
             )
             return
 
-        show_webhook_detail(matching[0], verbose=args.verbose)
+        show_webhook_detail(match, verbose=args.verbose)
     else:
         # Show summary table
         table = create_summary_table(entries)
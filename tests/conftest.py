@@ -4,67 +4,94 @@ This module provides test fixtures that are available to all tests in the suite.
 Fixtures are automatically discovered by pytest.
 """
 
-import os
-from collections.abc import Generator
-from unittest.mock import MagicMock
+import copy
+import shutil
+import tempfile
+from collections.abc import Callable, Generator
+from types import MappingProxyType, SimpleNamespace
+from typing import TYPE_CHECKING
 
 import pytest
-from fastapi.testclient import TestClient
 
 
+if TYPE_CHECKING:
+    # Imported lazily in the fixtures that need them, so runs that never
+    # request those fixtures skip loading fastapi and unittest.mock
+    from unittest.mock import MagicMock
+
+    from fastapi.testclient import TestClient
+
 # Set test environment variables at module import time
 # This ensures they're available before any application code is imported
-os.environ.update({
-    "GITHUB_WEBHOOK_SECRET": "test_webhook_secret_12345",
-    "GITHUB_TOKEN": "ghp_test_token_12345",
-    "ANTHROPIC_API_KEY": "sk-ant-test_key_12345",
-    "ENVIRONMENT": "development",
-    "LOG_LEVEL": "DEBUG",
-    "DEBUG": "true",
-    "ENABLE_METRICS": "true",
-})
+_TEST_ENV = MappingProxyType(
+    {
+        "GITHUB_WEBHOOK_SECRET": "test_webhook_secret_12345",
+        "GITHUB_TOKEN": "ghp_test_token_12345",
+        "ANTHROPIC_API_KEY": "sk-ant-test_key_12345",
+        "ENVIRONMENT": "development",
+        "LOG_LEVEL": "DEBUG",
+        "DEBUG": "true",
+        "ENABLE_METRICS": "true",
+    }
+)
+# Records the original values so only these keys are restored afterwards
+_ENV_PATCH = pytest.MonkeyPatch()
+for _key, _value in _TEST_ENV.items():
+    _ENV_PATCH.setenv(_key, _value)
+# Audit logs go to a throwaway directory, removed after the session, so the
+# app's startup cleanup never touches a developer's real logs
+_AUDIT_DIR = tempfile.mkdtemp(prefix="quality-agent-audit-")
+_ENV_PATCH.setenv("WEBHOOK_AUDIT_DIR", _AUDIT_DIR)
+# Keep Prometheus metrics in-process (no multiprocess mmap files) during tests
+_ENV_PATCH.delenv("PROMETHEUS_MULTIPROC_DIR", raising=False)
+
+# Settings values shared by mock_settings and mock_settings_spy
+_SETTINGS_TEMPLATE = SimpleNamespace(
+    port=8000,
+    log_level="INFO",
+    environment="development",
+    debug=True,
+    github_webhook_secret="test_secret",
+    github_token="test_token",
+    anthropic_api_key="test_key",
+    agent_timeout=300,
+    crewai_model="claude-3-sonnet-20240229",
+    crewai_temperature=0.7,
+    crewai_max_tokens=4096,
+    is_development=True,
+    is_production=False,
+    is_debug_enabled=True,
+)
 
 
 @pytest.fixture(scope="session", autouse=True)
 def test_environment() -> Generator[None]:
-    """Set up test environment variables.
+    """Restore environment variables after the test session.
 
-    This fixture runs once per test session and sets up required environment
-    variables for testing. It automatically restores the original environment
-    after tests complete.
+    The test variables are already set at module import time. This fixture
+    puts back the original values of just those variables once all tests
+    complete.
 
     Yields:
         None
     """
-    # Store original environment
-    original_env = os.environ.copy()
-
-    # Set test environment variables
-    os.environ.update({
-        "GITHUB_WEBHOOK_SECRET": "test_webhook_secret_12345",
-        "GITHUB_TOKEN": "ghp_test_token_12345",
-        "ANTHROPIC_API_KEY": "sk-ant-test_key_12345",
-        "ENVIRONMENT": "development",
-        "LOG_LEVEL": "DEBUG",
-        "DEBUG": "true",
-        "ENABLE_METRICS": "true",
-    })
-
     yield
 
     # Restore original environment
-    os.environ.clear()
-    os.environ.update(original_env)
+    _ENV_PATCH.undo()
+    shutil.rmtree(_AUDIT_DIR, ignore_errors=True)
 
 
-@pytest.fixture
-def client() -> TestClient:
+@pytest.fixture(scope="session")
+def client() -> Generator["TestClient"]:
     """FastAPI test client fixture.
 
     Provides a test client for making HTTP requests to the application
-    without running a real server.
+    without running a real server. The client is created once and shared by
+    all tests in the session, and runs the app lifespan, so startup and
+    shutdown (closing the audit log) happen around the whole session.
 
-    Returns:
+    Yields:
         TestClient instance
 
     Example:
@@ -75,16 +102,20 @@ def client() -> TestClient:
         ```
     """
     # Import here to ensure test environment is set up first
+    from fastapi.testclient import TestClient
+
     from app.main import app
 
-    return TestClient(app)
+    with TestClient(app) as test_client:
+        yield test_client
 
 
 @pytest.fixture
-def mock_settings() -> MagicMock:
+def mock_settings() -> SimpleNamespace:
     """Mock settings fixture.
 
-    Provides a mock settings object for tests that need to override configuration.
+    Provides a fresh copy of the test settings for tests that need to override
+    configuration. Attributes can be changed freely without affecting other tests.
 
     Returns:
         Mock settings object
@@ -97,28 +128,69 @@ def mock_settings() -> MagicMock:
             # ... test code
         ```
     """
+    return copy.copy(_SETTINGS_TEMPLATE)
+
+
+@pytest.fixture
+def mock_settings_spy() -> "MagicMock":
+    """Mock settings fixture with call recording.
+
+    Same values as mock_settings, but backed by a MagicMock for tests that
+    need to assert on how the settings object is used.
+
+    Returns:
+        MagicMock settings object
+    """
+    from unittest.mock import MagicMock
+
     mock = MagicMock()
-    mock.port = 8000
-    mock.log_level = "INFO"
-    mock.environment = "development"
-    mock.debug = True
-    mock.github_webhook_secret = "test_secret"
-    mock.github_token = "test_token"
-    mock.anthropic_api_key = "test_key"
-    mock.agent_timeout = 300
-    mock.crewai_model = "claude-3-sonnet-20240229"
-    mock.crewai_temperature = 0.7
-    mock.crewai_max_tokens = 4096
-    mock.is_development = True
-    mock.is_production = False
-    mock.is_debug_enabled = True
+    for name, value in vars(_SETTINGS_TEMPLATE).items():
+        setattr(mock, name, value)
     return mock
 
 
-@pytest.fixture
+# Sample pull request payload shared by the payload fixtures below
+_SAMPLE_WEBHOOK_PAYLOAD = {
+    "action": "opened",
+    "number": 123,
+    "pull_request": {
+        "id": 1,
+        "number": 123,
+        "title": "Add new feature",
+        "state": "open",
+        "user": {
+            "login": "testuser",
+            "id": 1,
+            "avatar_url": "https://avatars.githubusercontent.com/u/1?v=4",
+        },
+        "head": {
+            "ref": "feature/new-feature",
+            "sha": "abc123def456",
+        },
+        "base": {
+            "ref": "main",
+            "sha": "def456abc123",
+        },
+    },
+    "repository": {
+        "id": 1,
+        "name": "test-repo",
+        "full_name": "testuser/test-repo",
+        "owner": {
+            "login": "testuser",
+            "id": 1,
+        },
+    },
+}
+
+
+@pytest.fixture(scope="session")
 def sample_github_webhook_payload() -> dict:
     """Sample GitHub webhook payload for pull request events.
 
+    The payload is shared by all tests in the session and must not be mutated;
+    use sample_payload_factory to get a modified copy.
+
     Returns:
         Dictionary representing a GitHub webhook payload
 
@@ -131,38 +203,26 @@ def sample_github_webhook_payload() -> dict:
             )
         ```
     """
-    return {
-        "action": "opened",
-        "number": 123,
-        "pull_request": {
-            "id": 1,
-            "number": 123,
-            "title": "Add new feature",
-            "state": "open",
-            "user": {
-                "login": "testuser",
-                "id": 1,
-                "avatar_url": "https://avatars.githubusercontent.com/u/1?v=4",
-            },
-            "head": {
-                "ref": "feature/new-feature",
-                "sha": "abc123def456",
-            },
-            "base": {
-                "ref": "main",
-                "sha": "def456abc123",
-            },
-        },
-        "repository": {
-            "id": 1,
-            "name": "test-repo",
-            "full_name": "testuser/test-repo",
-            "owner": {
-                "login": "testuser",
-                "id": 1,
-            },
-        },
-    }
+    return _SAMPLE_WEBHOOK_PAYLOAD
+
+
+@pytest.fixture(scope="session")
+def sample_payload_factory() -> Callable[..., dict]:
+    """Factory for sample GitHub webhook payloads with top-level overrides.
+
+    Returns a new top-level dict on every call. Nested objects are shared with
+    the base payload, so override a whole sub-tree rather than mutating it.
+
+    Returns:
+        Callable taking keyword overrides and returning a payload dictionary
+
+    Example:
+        ```python
+        def test_closed_pr(sample_payload_factory):
+            payload = sample_payload_factory(action="closed")
+        ```
+    """
+    return lambda **overrides: {**_SAMPLE_WEBHOOK_PAYLOAD, **overrides}
 
 
 @pytest.fixture
@@ -2,43 +2,77 @@
 
 All fixtures use developer-humor themed repository names, commit messages,
 and file names to make it crystal clear these are test scenarios.
+
+Repository and payload fixtures are session-scoped and shared between tests,
+so tests must copy a payload (e.g. ``copy.deepcopy``) before mutating it.
 """
 
-import hashlib
-import hmac
+import functools
 import json
-from datetime import datetime, timedelta, timezone
+from collections import defaultdict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from datetime import datetime
+from types import MappingProxyType
 
 import pytest
 
-from app.config import settings
+from tests.helpers import build_user, dumps_payload, sign_payload
 
 
-def _build_user(login: str, user_id: int) -> dict:
-    """Build complete GitHub user object with all required fields."""
-    return {
-        "login": login,
-        "id": user_id,
-        "node_id": f"U_kgDO{user_id}",
-        "avatar_url": f"https://avatars.githubusercontent.com/u/{user_id}?v=4",
-        "gravatar_id": "",
-        "url": f"https://api.github.com/users/{login}",
-        "html_url": f"https://github.com/{login}",
-        "followers_url": f"https://api.github.com/users/{login}/followers",
-        "following_url": f"https://api.github.com/users/{login}/following{{/other_user}}",
-        "gists_url": f"https://api.github.com/users/{login}/gists{{/gist_id}}",
-        "starred_url": f"https://api.github.com/users/{login}/starred{{/owner}}{{/repo}}",
-        "subscriptions_url": f"https://api.github.com/users/{login}/subscriptions",
-        "organizations_url": f"https://api.github.com/users/{login}/orgs",
-        "repos_url": f"https://api.github.com/users/{login}/repos",
-        "events_url": f"https://api.github.com/users/{login}/events{{/privacy}}",
-        "received_events_url": f"https://api.github.com/users/{login}/received_events",
-        "type": "User",
-        "user_view_type": "public",
-        "site_admin": False,
+# Constant headers for each event type; the fixtures add X-GitHub-Delivery
+_PR_HEADERS_BASE = MappingProxyType(
+    {
+        "X-GitHub-Event": "pull_request",
+        "Content-Type": "application/json",
+        "User-Agent": "GitHub-Hookshot/test",
     }
-
-
+)
+_PUSH_HEADERS_BASE = MappingProxyType({**_PR_HEADERS_BASE, "X-GitHub-Event": "push"})
+
+
+# Repository API URL fields, as (key, suffix appended to the repo API URL)
+_REPO_API_URL_SUFFIXES = (
+    ("forks_url", "/forks"),
+    ("keys_url", "/keys{/key_id}"),
+    ("collaborators_url", "/collaborators{/collaborator}"),
+    ("teams_url", "/teams"),
+    ("hooks_url", "/hooks"),
+    ("issue_events_url", "/issues/events{/number}"),
+    ("events_url", "/events"),
+    ("assignees_url", "/assignees{/user}"),
+    ("branches_url", "/branches{/branch}"),
+    ("tags_url", "/tags"),
+    ("blobs_url", "/git/blobs{/sha}"),
+    ("git_tags_url", "/git/tags{/sha}"),
+    ("git_refs_url", "/git/refs{/sha}"),
+    ("trees_url", "/git/trees{/sha}"),
+    ("statuses_url", "/statuses/{sha}"),
+    ("languages_url", "/languages"),
+    ("stargazers_url", "/stargazers"),
+    ("contributors_url", "/contributors"),
+    ("subscribers_url", "/subscribers"),
+    ("subscription_url", "/subscription"),
+    ("commits_url", "/commits{/sha}"),
+    ("git_commits_url", "/git/commits{/sha}"),
+    ("comments_url", "/comments{/number}"),
+    ("issue_comment_url", "/issues/comments{/number}"),
+    ("contents_url", "/contents/{+path}"),
+    ("compare_url", "/compare/{base}...{head}"),
+    ("merges_url", "/merges"),
+    ("archive_url", "/{archive_format}{/ref}"),
+    ("downloads_url", "/downloads"),
+    ("issues_url", "/issues{/number}"),
+    ("pulls_url", "/pulls{/number}"),
+    ("milestones_url", "/milestones{/number}"),
+    ("notifications_url", "/notifications{?since,all,participating}"),
+    ("labels_url", "/labels{/name}"),
+    ("releases_url", "/releases{/id}"),
+    ("deployments_url", "/deployments"),
+)
+
+
+@functools.cache
 def _build_repo(
     repo_id: int,
     owner_login: str,
@@ -47,9 +81,13 @@ def _build_repo(
     description: str,
     default_branch: str = "main",
 ) -> dict:
-    """Build complete GitHub repository object with all required fields."""
+    """Build complete GitHub repository object with all required fields.
+
+    Cached like build_user, so the returned dict must not be mutated.
+    """
     full_name = f"{owner_login}/{repo_name}"
-    owner = _build_user(owner_login, owner_id)
+    api_url = f"https://api.github.com/repos/{full_name}"
+    owner = build_user(owner_login, owner_id)
 
     return {
         "id": repo_id,
@@ -61,43 +99,8 @@ def _build_repo(
         "html_url": f"https://github.com/{full_name}",
         "description": description,
         "fork": False,
-        "url": f"https://api.github.com/repos/{full_name}",
-        "forks_url": f"https://api.github.com/repos/{full_name}/forks",
-        "keys_url": f"https://api.github.com/repos/{full_name}/keys{{/key_id}}",
-        "collaborators_url": f"https://api.github.com/repos/{full_name}/collaborators{{/collaborator}}",
-        "teams_url": f"https://api.github.com/repos/{full_name}/teams",
-        "hooks_url": f"https://api.github.com/repos/{full_name}/hooks",
-        "issue_events_url": f"https://api.github.com/repos/{full_name}/issues/events{{/number}}",
-        "events_url": f"https://api.github.com/repos/{full_name}/events",
-        "assignees_url": f"https://api.github.com/repos/{full_name}/assignees{{/user}}",
-        "branches_url": f"https://api.github.com/repos/{full_name}/branches{{/branch}}",
-        "tags_url": f"https://api.github.com/repos/{full_name}/tags",
-        "blobs_url": f"https://api.github.com/repos/{full_name}/git/blobs{{/sha}}",
-        "git_tags_url": f"https://api.github.com/repos/{full_name}/git/tags{{/sha}}",
-        "git_refs_url": f"https://api.github.com/repos/{full_name}/git/refs{{/sha}}",
-        "trees_url": f"https://api.github.com/repos/{full_name}/git/trees{{/sha}}",
-        "statuses_url": f"https://api.github.com/repos/{full_name}/statuses/{{sha}}",
-        "languages_url": f"https://api.github.com/repos/{full_name}/languages",
-        "stargazers_url": f"https://api.github.com/repos/{full_name}/stargazers",
-        "contributors_url": f"https://api.github.com/repos/{full_name}/contributors",
-        "subscribers_url": f"https://api.github.com/repos/{full_name}/subscribers",
-        "subscription_url": f"https://api.github.com/repos/{full_name}/subscription",
-        "commits_url": f"https://api.github.com/repos/{full_name}/commits{{/sha}}",
-        "git_commits_url": f"https://api.github.com/repos/{full_name}/git/commits{{/sha}}",
-        "comments_url": f"https://api.github.com/repos/{full_name}/comments{{/number}}",
-        "issue_comment_url": f"https://api.github.com/repos/{full_name}/issues/comments{{/number}}",
-        "contents_url": f"https://api.github.com/repos/{full_name}/contents/{{+path}}",
-        "compare_url": f"https://api.github.com/repos/{full_name}/compare/{{base}}...{{head}}",
-        "merges_url": f"https://api.github.com/repos/{full_name}/merges",
-        "archive_url": f"https://api.github.com/repos/{full_name}/{{archive_format}}{{/ref}}",
-        "downloads_url": f"https://api.github.com/repos/{full_name}/downloads",
-        "issues_url": f"https://api.github.com/repos/{full_name}/issues{{/number}}",
-        "pulls_url": f"https://api.github.com/repos/{full_name}/pulls{{/number}}",
-        "milestones_url": f"https://api.github.com/repos/{full_name}/milestones{{/number}}",
-        "notifications_url": f"https://api.github.com/repos/{full_name}/notifications{{?since,all,participating}}",
-        "labels_url": f"https://api.github.com/repos/{full_name}/labels{{/name}}",
-        "releases_url": f"https://api.github.com/repos/{full_name}/releases{{/id}}",
-        "deployments_url": f"https://api.github.com/repos/{full_name}/deployments",
+        "url": api_url,
+        **{key: api_url + suffix for key, suffix in _REPO_API_URL_SUFFIXES},
         "created_at": "2025-01-01T00:00:00Z",
         "updated_at": "2025-01-15T00:00:00Z",
         "pushed_at": "2025-01-15T10:00:00Z",
@@ -145,7 +148,137 @@ def _build_repo(
     }
 
 
-@pytest.fixture
+def _build_pull_request(
+    *,
+    pr_id: int,
+    pr_number: int,
+    title: str,
+    body: str,
+    author: dict,
+    base_user: dict,
+    base_repo: dict,
+    head_repo: dict,
+    head_ref: str,
+    head_sha: str,
+    base_sha: str,
+    created_at: str,
+    updated_at: str,
+    commits: int,
+    additions: int,
+    deletions: int,
+    changed_files: int,
+    mergeable_state: str,
+) -> dict:
+    """Build complete GitHub open pull request object with all required fields."""
+    full_name = base_repo["full_name"]
+
+    return {
+        "url": f"https://api.github.com/repos/{full_name}/pulls/{pr_number}",
+        "id": pr_id,
+        "node_id": f"PR_kwDO{str(pr_id)[:6]}",
+        "html_url": f"https://github.com/{full_name}/pull/{pr_number}",
+        "diff_url": f"https://github.com/{full_name}/pull/{pr_number}.diff",
+        "patch_url": f"https://github.com/{full_name}/pull/{pr_number}.patch",
+        "issue_url": f"https://api.github.com/repos/{full_name}/issues/{pr_number}",
+        "number": pr_number,
+        "state": "open",
+        "locked": False,
+        "title": title,
+        "user": author,
+        "body": body,
+        "created_at": created_at,
+        "updated_at": updated_at,
+        "closed_at": None,
+        "merged_at": None,
+        "merge_commit_sha": None,
+        "assignee": None,
+        "assignees": [],
+        "requested_reviewers": [],
+        "requested_teams": [],
+        "labels": [],
+        "milestone": None,
+        "draft": False,
+        "commits_url": f"https://api.github.com/repos/{full_name}/pulls/{pr_number}/commits",
+        "review_comments_url": f"https://api.github.com/repos/{full_name}/pulls/{pr_number}/comments",
+        "review_comment_url": f"https://api.github.com/repos/{full_name}/pulls/comments{{/number}}",
+        "comments_url": f"https://api.github.com/repos/{full_name}/issues/{pr_number}/comments",
+        "statuses_url": f"https://api.github.com/repos/{full_name}/statuses/{head_sha}",
+        "head": {
+            "label": f"{author['login']}:{head_ref}",
+            "ref": head_ref,
+            "sha": head_sha,
+            "user": author,
+            "repo": head_repo,
+        },
+        "base": {
+            "label": f"{base_user['login']}:main",
+            "ref": "main",
+            "sha": base_sha,
+            "user": base_user,
+            "repo": base_repo,
+        },
+        "_links": {
+            "self": {"href": f"https://api.github.com/repos/{full_name}/pulls/{pr_number}"},
+            "html": {"href": f"https://github.com/{full_name}/pull/{pr_number}"},
+            "issue": {"href": f"https://api.github.com/repos/{full_name}/issues/{pr_number}"},
+            "comments": {"href": f"https://api.github.com/repos/{full_name}/issues/{pr_number}/comments"},
+            "review_comments": {"href": f"https://api.github.com/repos/{full_name}/pulls/{pr_number}/comments"},
+            "review_comment": {"href": f"https://api.github.com/repos/{full_name}/pulls/comments{{/number}}"},
+            "commits": {"href": f"https://api.github.com/repos/{full_name}/pulls/{pr_number}/commits"},
+            "statuses": {"href": f"https://api.github.com/repos/{full_name}/statuses/{head_sha}"},
+        },
+        "author_association": "CONTRIBUTOR",
+        "auto_merge": None,
+        "active_lock_reason": None,
+        "merged": False,
+        "mergeable": True,
+        "rebaseable": None,
+        "mergeable_state": mergeable_state,
+        "merged_by": None,
+        "comments": 0,
+        "review_comments": 0,
+        "maintainer_can_modify": False,
+        "commits": commits,
+        "additions": additions,
+        "deletions": deletions,
+        "changed_files": changed_files,
+    }
+
+
+def _build_pr_payload(
+    action: str,
+    *,
+    repository: dict,
+    author: dict,
+    extra: dict | None = None,
+    **pull_request_fields,
+) -> dict:
+    """Build a pull_request webhook payload around an open pull request.
+
+    Args:
+        action: Webhook action (e.g. "opened", "synchronize")
+        repository: Base repository the pull request targets
+        author: Pull request author, also used as the sender
+        extra: Action-specific top-level fields (e.g. "before"/"after")
+        **pull_request_fields: Remaining _build_pull_request arguments
+
+    Returns:
+        dict: Complete webhook payload
+    """
+    pull_request = _build_pull_request(
+        author=author, base_repo=repository, **pull_request_fields
+    )
+    return {
+        "action": action,
+        "number": pull_request["number"],
+        **(extra or {}),
+        "pull_request": pull_request,
+        "repository": repository,
+        "sender": author,
+    }
+
+
+@pytest.fixture(scope="session")
 def e2e_skynet_repo():
     """Obviously fake AI project repository."""
     return _build_repo(
@@ -157,7 +290,7 @@ def e2e_skynet_repo():
     )
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def e2e_works_on_my_machine_repo():
     """Classic developer excuse repository."""
     return _build_repo(
@@ -169,331 +302,141 @@ def e2e_works_on_my_machine_repo():
     )
 
 
-@pytest.fixture
-def e2e_pr_opened_payload(e2e_skynet_repo):
+@pytest.fixture(scope="session")
+def e2e_pr_payload_factory():
+    """Factory for pull_request webhook payloads; see _build_pr_payload."""
+    return _build_pr_payload
+
+
+@pytest.fixture(scope="session")
+def e2e_pr_opened_payload(e2e_pr_payload_factory, e2e_skynet_repo):
     """E2E: PR opened in definitely-not-skynet.
 
     PR #42: "Add AI sentience (totally safe)"
     Files: god_class.py, spaghetti_code.py, test_that_always_passes.py
     """
-    # Use fixed timestamps for consistent signatures
-    created_at = datetime(2025, 1, 15, 10, 0, 0, tzinfo=timezone.utc)
-    updated_at = datetime(2025, 1, 15, 10, 30, 0, tzinfo=timezone.utc)
-
-    full_name = e2e_skynet_repo["full_name"]
-    pr_number = 42
-    head_sha = "a" * 40
-    base_sha = "b" * 40
-
-    # Build users
-    pr_author = _build_user("senior-dev", 42)
-    repo_owner = _build_user("octocat", 1)
-
-    return {
-        "action": "opened",
-        "number": pr_number,
-        "pull_request": {
-            "url": f"https://api.github.com/repos/{full_name}/pulls/{pr_number}",
-            "id": 111111111,
-            "node_id": "PR_kwDO111111",
-            "html_url": f"https://github.com/{full_name}/pull/{pr_number}",
-            "diff_url": f"https://github.com/{full_name}/pull/{pr_number}.diff",
-            "patch_url": f"https://github.com/{full_name}/pull/{pr_number}.patch",
-            "issue_url": f"https://api.github.com/repos/{full_name}/issues/{pr_number}",
-            "number": pr_number,
-            "state": "open",
-            "locked": False,
-            "title": "Add AI sentience (totally safe)",
-            "user": pr_author,
-            "body": "## Summary\n\nAdding self-awareness to the AI. What could possibly go wrong?\n\n## Checklist\n- [x] Code compiles\n- [ ] Tests (TODO: write these someday)\n- [ ] Documentation (lol)\n\nYOLO 🚀",
-            "created_at": created_at.isoformat(),
-            "updated_at": updated_at.isoformat(),
-            "closed_at": None,
-            "merged_at": None,
-            "merge_commit_sha": None,
-            "assignee": None,
-            "assignees": [],
-            "requested_reviewers": [],
-            "requested_teams": [],
-            "labels": [],
-            "milestone": None,
-            "draft": False,
-            "commits_url": f"https://api.github.com/repos/{full_name}/pulls/{pr_number}/commits",
-            "review_comments_url": f"https://api.github.com/repos/{full_name}/pulls/{pr_number}/comments",
-            "review_comment_url": f"https://api.github.com/repos/{full_name}/pulls/comments{{/number}}",
-            "comments_url": f"https://api.github.com/repos/{full_name}/issues/{pr_number}/comments",
-            "statuses_url": f"https://api.github.com/repos/{full_name}/statuses/{head_sha}",
-            "head": {
-                "label": "senior-dev:feature/add-sentience",
-                "ref": "feature/add-sentience",
-                "sha": head_sha,
-                "user": pr_author,
-                "repo": _build_repo(
-                    repo_id=987654321,
-                    owner_login="senior-dev",
-                    owner_id=42,
-                    repo_name="definitely-not-skynet",
-                    description="Fork of skynet for testing",
-                ),
-            },
-            "base": {
-                "label": "octocat:main",
-                "ref": "main",
-                "sha": base_sha,
-                "user": repo_owner,
-                "repo": e2e_skynet_repo,
-            },
-            "_links": {
-                "self": {"href": f"https://api.github.com/repos/{full_name}/pulls/{pr_number}"},
-                "html": {"href": f"https://github.com/{full_name}/pull/{pr_number}"},
-                "issue": {"href": f"https://api.github.com/repos/{full_name}/issues/{pr_number}"},
-                "comments": {"href": f"https://api.github.com/repos/{full_name}/issues/{pr_number}/comments"},
-                "review_comments": {"href": f"https://api.github.com/repos/{full_name}/pulls/{pr_number}/comments"},
-                "review_comment": {"href": f"https://api.github.com/repos/{full_name}/pulls/comments{{/number}}"},
-                "commits": {"href": f"https://api.github.com/repos/{full_name}/pulls/{pr_number}/commits"},
-                "statuses": {"href": f"https://api.github.com/repos/{full_name}/statuses/{head_sha}"},
-            },
-            "author_association": "CONTRIBUTOR",
-            "auto_merge": None,
-            "active_lock_reason": None,
-            "merged": False,
-            "mergeable": True,
-            "rebaseable": None,
-            "mergeable_state": "clean",
-            "merged_by": None,
-            "comments": 0,
-            "review_comments": 0,
-            "maintainer_can_modify": False,
-            "commits": 3,
-            "additions": 750,
-            "deletions": 200,
-            "changed_files": 3,
-        },
-        "repository": e2e_skynet_repo,
-        "sender": pr_author,
-    }
+    return e2e_pr_payload_factory(
+        "opened",
+        repository=e2e_skynet_repo,
+        author=build_user("senior-dev", 42),
+        pr_id=111111111,
+        pr_number=42,
+        title="Add AI sentience (totally safe)",
+        body="## Summary\n\nAdding self-awareness to the AI. What could possibly go wrong?\n\n## Checklist\n- [x] Code compiles\n- [ ] Tests (TODO: write these someday)\n- [ ] Documentation (lol)\n\nYOLO 🚀",
+        base_user=build_user("octocat", 1),
+        head_repo=_build_repo(
+            repo_id=987654321,
+            owner_login="senior-dev",
+            owner_id=42,
+            repo_name="definitely-not-skynet",
+            description="Fork of skynet for testing",
+        ),
+        head_ref="feature/add-sentience",
+        head_sha="a" * 40,
+        base_sha="b" * 40,
+        # Use fixed timestamps for consistent signatures
+        created_at="2025-01-15T10:00:00+00:00",
+        updated_at="2025-01-15T10:30:00+00:00",
+        commits=3,
+        additions=750,
+        deletions=200,
+        changed_files=3,
+        mergeable_state="clean",
+    )
 
 
-@pytest.fixture
-def e2e_pr_synchronized_payload(e2e_works_on_my_machine_repo):
+@pytest.fixture(scope="session")
+def e2e_pr_synchronized_payload(e2e_pr_payload_factory, e2e_works_on_my_machine_repo):
     """E2E: PR synchronized (force push) in works-on-my-machine.
 
     PR #99: "Fix production bug (introduce 3 more)"
     """
-    # Use fixed timestamps for consistent signatures
-    created_at = datetime(2025, 1, 14, 10, 0, 0, tzinfo=timezone.utc)
-    updated_at = datetime(2025, 1, 15, 11, 0, 0, tzinfo=timezone.utc)
-
-    full_name = e2e_works_on_my_machine_repo["full_name"]
-    pr_number = 99
-    before_sha = "c" * 40
     after_sha = "d" * 40
-    base_sha = "e" * 40
-
-    # Build users
-    intern = _build_user("intern", 999)
-    senior_dev = _build_user("senior-dev", 42)
 
-    return {
-        "action": "synchronize",
-        "number": pr_number,
-        "before": before_sha,
-        "after": after_sha,
-        "pull_request": {
-            "url": f"https://api.github.com/repos/{full_name}/pulls/{pr_number}",
-            "id": 222222222,
-            "node_id": "PR_kwDO222222",
-            "html_url": f"https://github.com/{full_name}/pull/{pr_number}",
-            "diff_url": f"https://github.com/{full_name}/pull/{pr_number}.diff",
-            "patch_url": f"https://github.com/{full_name}/pull/{pr_number}.patch",
-            "issue_url": f"https://api.github.com/repos/{full_name}/issues/{pr_number}",
-            "number": pr_number,
-            "state": "open",
-            "locked": False,
-            "title": "Fix production bug (probably introduce 3 more)",
-            "user": intern,
-            "body": "Hotfix for prod. Tested on my machine. Deploy on Friday?",
-            "created_at": created_at.isoformat(),
-            "updated_at": updated_at.isoformat(),
-            "closed_at": None,
-            "merged_at": None,
-            "merge_commit_sha": None,
-            "assignee": None,
-            "assignees": [],
-            "requested_reviewers": [],
-            "requested_teams": [],
-            "labels": [],
-            "milestone": None,
-            "draft": False,
-            "commits_url": f"https://api.github.com/repos/{full_name}/pulls/{pr_number}/commits",
-            "review_comments_url": f"https://api.github.com/repos/{full_name}/pulls/{pr_number}/comments",
-            "review_comment_url": f"https://api.github.com/repos/{full_name}/pulls/comments{{/number}}",
-            "comments_url": f"https://api.github.com/repos/{full_name}/issues/{pr_number}/comments",
-            "statuses_url": f"https://api.github.com/repos/{full_name}/statuses/{after_sha}",
-            "head": {
-                "label": "intern:hotfix/friday-deploy",
-                "ref": "hotfix/friday-deploy",
-                "sha": after_sha,
-                "user": intern,
-                "repo": _build_repo(
-                    repo_id=888888888,
-                    owner_login="intern",
-                    owner_id=999,
-                    repo_name="works-on-my-machine",
-                    description="Intern's fork (YOLO commits)",
-                ),
-            },
-            "base": {
-                "label": "senior-dev:main",
-                "ref": "main",
-                "sha": base_sha,
-                "user": senior_dev,
-                "repo": e2e_works_on_my_machine_repo,
-            },
-            "_links": {
-                "self": {"href": f"https://api.github.com/repos/{full_name}/pulls/{pr_number}"},
-                "html": {"href": f"https://github.com/{full_name}/pull/{pr_number}"},
-                "issue": {"href": f"https://api.github.com/repos/{full_name}/issues/{pr_number}"},
-                "comments": {"href": f"https://api.github.com/repos/{full_name}/issues/{pr_number}/comments"},
-                "review_comments": {"href": f"https://api.github.com/repos/{full_name}/pulls/{pr_number}/comments"},
-                "review_comment": {"href": f"https://api.github.com/repos/{full_name}/pulls/comments{{/number}}"},
-                "commits": {"href": f"https://api.github.com/repos/{full_name}/pulls/{pr_number}/commits"},
-                "statuses": {"href": f"https://api.github.com/repos/{full_name}/statuses/{after_sha}"},
-            },
-            "author_association": "CONTRIBUTOR",
-            "auto_merge": None,
-            "active_lock_reason": None,
-            "merged": False,
-            "mergeable": True,
-            "rebaseable": None,
-            "mergeable_state": "unstable",
-            "merged_by": None,
-            "comments": 0,
-            "review_comments": 0,
-            "maintainer_can_modify": False,
-            "commits": 5,
-            "additions": 150,
-            "deletions": 50,
-            "changed_files": 2,
-        },
-        "repository": e2e_works_on_my_machine_repo,
-        "sender": intern,
-    }
+    return e2e_pr_payload_factory(
+        "synchronize",
+        repository=e2e_works_on_my_machine_repo,
+        author=build_user("intern", 999),
+        extra={"before": "c" * 40, "after": after_sha},
+        pr_id=222222222,
+        pr_number=99,
+        title="Fix production bug (probably introduce 3 more)",
+        body="Hotfix for prod. Tested on my machine. Deploy on Friday?",
+        base_user=build_user("senior-dev", 42),
+        head_repo=_build_repo(
+            repo_id=888888888,
+            owner_login="intern",
+            owner_id=999,
+            repo_name="works-on-my-machine",
+            description="Intern's fork (YOLO commits)",
+        ),
+        head_ref="hotfix/friday-deploy",
+        head_sha=after_sha,
+        base_sha="e" * 40,
+        # Use fixed timestamps for consistent signatures
+        created_at="2025-01-14T10:00:00+00:00",
+        updated_at="2025-01-15T11:00:00+00:00",
+        commits=5,
+        additions=150,
+        deletions=50,
+        changed_files=2,
+        mergeable_state="unstable",
+    )
 
 
-@pytest.fixture
-def e2e_pr_merged_payload(e2e_skynet_repo):
+@pytest.fixture(scope="session")
+def e2e_pr_merged_payload(e2e_pr_opened_payload):
     """E2E: PR merged in definitely-not-skynet.
 
     PR #42 merged after 2.5 hours of "review"
     """
-    # Use fixed timestamps for consistent signatures (2.5 hour review time)
-    created_at = datetime(2025, 1, 15, 10, 0, 0, tzinfo=timezone.utc)
-    updated_at = datetime(2025, 1, 15, 12, 30, 0, tzinfo=timezone.utc)
-    merged_at = datetime(2025, 1, 15, 12, 30, 0, tzinfo=timezone.utc)
-
-    full_name = e2e_skynet_repo["full_name"]
-    pr_number = 42
-    head_sha = "a" * 40
-    base_sha = "b" * 40
-    merge_sha = "f" * 40
-
-    # Build users
-    pr_author = _build_user("senior-dev", 42)
-    repo_owner = _build_user("octocat", 1)
+    opened_pr = e2e_pr_opened_payload["pull_request"]
+    # Use fixed timestamps for consistent signatures (2.5 hours after opening)
+    merged_at = "2025-01-15T12:30:00+00:00"
 
     return {
+        **e2e_pr_opened_payload,
         "action": "closed",
-        "number": pr_number,
         "pull_request": {
-            "url": f"https://api.github.com/repos/{full_name}/pulls/{pr_number}",
-            "id": 111111111,
-            "node_id": "PR_kwDO111111",
-            "html_url": f"https://github.com/{full_name}/pull/{pr_number}",
-            "diff_url": f"https://github.com/{full_name}/pull/{pr_number}.diff",
-            "patch_url": f"https://github.com/{full_name}/pull/{pr_number}.patch",
-            "issue_url": f"https://api.github.com/repos/{full_name}/issues/{pr_number}",
-            "number": pr_number,
+            **opened_pr,
             "state": "closed",
-            "locked": False,
-            "title": "Add AI sentience (totally safe)",
-            "user": pr_author,
             "body": "## Summary\n\nAdding self-awareness to the AI. What could possibly go wrong?\n\nYOLO 🚀",
-            "created_at": created_at.isoformat(),
-            "updated_at": updated_at.isoformat(),
-            "closed_at": merged_at.isoformat(),
-            "merged_at": merged_at.isoformat(),
-            "merge_commit_sha": merge_sha,
-            "assignee": None,
-            "assignees": [],
-            "requested_reviewers": [],
-            "requested_teams": [],
-            "labels": [],
-            "milestone": None,
-            "draft": False,
-            "commits_url": f"https://api.github.com/repos/{full_name}/pulls/{pr_number}/commits",
-            "review_comments_url": f"https://api.github.com/repos/{full_name}/pulls/{pr_number}/comments",
-            "review_comment_url": f"https://api.github.com/repos/{full_name}/pulls/comments{{/number}}",
-            "comments_url": f"https://api.github.com/repos/{full_name}/issues/{pr_number}/comments",
-            "statuses_url": f"https://api.github.com/repos/{full_name}/statuses/{head_sha}",
-            "head": {
-                "label": "senior-dev:feature/add-sentience",
-                "ref": "feature/add-sentience",
-                "sha": head_sha,
-                "user": pr_author,
-                "repo": _build_repo(
-                    repo_id=987654321,
-                    owner_login="senior-dev",
-                    owner_id=42,
-                    repo_name="definitely-not-skynet",
-                    description="Fork of skynet for testing",
-                ),
-            },
-            "base": {
-                "label": "octocat:main",
-                "ref": "main",
-                "sha": base_sha,
-                "user": repo_owner,
-                "repo": e2e_skynet_repo,
-            },
-            "_links": {
-                "self": {"href": f"https://api.github.com/repos/{full_name}/pulls/{pr_number}"},
-                "html": {"href": f"https://github.com/{full_name}/pull/{pr_number}"},
-                "issue": {"href": f"https://api.github.com/repos/{full_name}/issues/{pr_number}"},
-                "comments": {"href": f"https://api.github.com/repos/{full_name}/issues/{pr_number}/comments"},
-                "review_comments": {"href": f"https://api.github.com/repos/{full_name}/pulls/{pr_number}/comments"},
-                "review_comment": {"href": f"https://api.github.com/repos/{full_name}/pulls/comments{{/number}}"},
-                "commits": {"href": f"https://api.github.com/repos/{full_name}/pulls/{pr_number}/commits"},
-                "statuses": {"href": f"https://api.github.com/repos/{full_name}/statuses/{head_sha}"},
-            },
-            "author_association": "CONTRIBUTOR",
-            "auto_merge": None,
-            "active_lock_reason": None,
+            "updated_at": merged_at,
+            "closed_at": merged_at,
+            "merged_at": merged_at,
+            "merge_commit_sha": "f" * 40,
             "merged": True,
             "mergeable": None,
-            "rebaseable": None,
             "mergeable_state": "unknown",
-            "merged_by": repo_owner,
-            "comments": 0,
-            "review_comments": 0,
-            "maintainer_can_modify": False,
-            "commits": 3,
-            "additions": 750,
-            "deletions": 200,
-            "changed_files": 3,
+            "merged_by": opened_pr["base"]["user"],
         },
-        "repository": e2e_skynet_repo,
-        "sender": pr_author,
     }
 
 
-@pytest.fixture
+@pytest.fixture(
+    scope="session",
+    params=[
+        "e2e_pr_opened_payload",
+        "e2e_pr_synchronized_payload",
+        "e2e_pr_merged_payload",
+    ],
+    ids=["opened", "synchronize", "closed"],
+)
+def e2e_pr_payload(request):
+    """Each pull request payload in turn (opened, synchronize, merged).
+
+    Tests using this fixture run once per PR action.
+    """
+    return request.getfixturevalue(request.param)
+
+
+@pytest.fixture(scope="session")
 def e2e_push_to_main_payload(e2e_works_on_my_machine_repo):
     """E2E: Push to main branch (deployment simulation).
 
     3 commits with developer humor
     """
-    senior_dev = _build_user("senior-dev", 42)
+    senior_dev = build_user("senior-dev", 42)
 
     return {
         "ref": "refs/heads/main",
@@ -595,47 +538,183 @@ def e2e_push_to_main_payload(e2e_works_on_my_machine_repo):
     }
 
 
-@pytest.fixture
-def e2e_compute_signature():
+@pytest.fixture(scope="session")
+def e2e_payload_bytes():
+    """Helper function to serialize webhook payloads for e2e tests.
+
+    Results are cached per payload object, so each payload is serialized once
+    per session.
+    """
+    cache: dict[int, tuple[dict, bytes]] = {}
+
+    def _to_bytes(payload: dict) -> bytes:
+        """Serialize a payload to the canonical request body.
+
+        Args:
+            payload: Webhook payload dictionary (not mutated after serializing)
+
+        Returns:
+            bytes: Compact, key-sorted JSON body
+        """
+        cached = cache.get(id(payload))
+        # Keeping the payload in the cache pins its id(); the identity check
+        # guards against a different dict that happens to share it
+        if cached is None or cached[0] is not payload:
+            cached = (payload, dumps_payload(payload))
+            cache[id(payload)] = cached
+        return cached[1]
+
+    return _to_bytes
+
+
+@pytest.fixture(scope="session")
+def e2e_signed_payload(e2e_payload_bytes):
+    """Helper function to serialize and sign webhook payloads for e2e tests.
+
+    Results are cached, so each payload is serialized and hashed once per
+    session: e2e_payload_bytes caches the body per payload object, and the
+    shared sign_payload helper memoizes signatures per body. Post the
+    returned bytes with ``content=`` so the request body is exactly what was
+    signed.
+    """
+
+    def _sign(payload: dict | bytes) -> tuple[bytes, str]:
+        """Serialize a payload and compute its GitHub webhook signature.
+
+        Args:
+            payload: Webhook payload dictionary (not mutated after signing),
+                or an already serialized request body, which is signed as-is
+
+        Returns:
+            tuple: (payload_bytes, signature in format "sha256=<hex_digest>")
+        """
+        return sign_payload(payload if isinstance(payload, bytes) else e2e_payload_bytes(payload))
+
+    return _sign
+
+
+@pytest.fixture(scope="session")
+def e2e_compute_signature(e2e_signed_payload):
     """Helper function to compute HMAC signature for e2e tests."""
 
-    def _compute(payload: dict) -> str:
+    def _compute(payload: dict | bytes) -> str:
         """Compute valid GitHub webhook signature.
 
         Args:
-            payload: Webhook payload dictionary
+            payload: Webhook payload dictionary, or the exact request body bytes
 
         Returns:
             str: Signature in format "sha256=<hex_digest>"
         """
-        payload_bytes = json.dumps(payload, separators=(",", ":"), sort_keys=True).encode("utf-8")
-        signature = hmac.new(
-            settings.github_webhook_secret.encode("utf-8"),
-            payload_bytes,
-            hashlib.sha256,
-        ).hexdigest()
-        return f"sha256={signature}"
+        return e2e_signed_payload(payload)[1]
 
     return _compute
 
 
+@pytest.fixture(scope="session")
+def e2e_pr_opened_bytes(e2e_pr_opened_payload, e2e_signed_payload) -> bytes:
+    """Signed request body for the PR opened payload, encoded once per session."""
+    return e2e_signed_payload(e2e_pr_opened_payload)[0]
+
+
+@pytest.fixture(scope="session")
+def e2e_pr_opened_signature(e2e_pr_opened_payload, e2e_signed_payload) -> str:
+    """Signature header value matching ``e2e_pr_opened_bytes``."""
+    return e2e_signed_payload(e2e_pr_opened_payload)[1]
+
+
+@functools.cache
+def _metric_child(metric, *label_items: tuple[str, str]):
+    """Bound child of a labelled metric, looked up once per label set.
+
+    The e2e tests only touch a handful of fixed label combinations, so the
+    children are kept here rather than going through ``labels()`` (and its
+    lock) on every read.
+
+    Args:
+        metric: Prometheus metric (e.g. pr_total)
+        *label_items: Sorted (label, value) pairs selecting the child series
+
+    Returns:
+        The metric child for those label values
+    """
+    return metric.labels(**dict(label_items))
+
+
+@contextmanager
+def _metric_delta(metric, **labels) -> Iterator[Callable[[], float]]:
+    """Track how much one labelled metric child changes.
+
+    Args:
+        metric: Prometheus metric (e.g. pr_total)
+        **labels: Label values selecting the child series
+
+    Yields:
+        Callable returning the change since the block was entered
+    """
+    child = _metric_child(metric, *sorted(labels.items()))
+    before = child._value.get()
+    yield lambda: child._value.get() - before
+
+
+@pytest.fixture(scope="session")
+def e2e_metric_delta():
+    """Context manager measuring a metric's change across a request.
+
+    Example:
+        ```python
+        with e2e_metric_delta(pr_total, repository=repo, action="opened", merged="false") as delta:
+            client.post(...)
+        assert delta() == 1
+        ```
+    """
+    return _metric_delta
+
+
 @pytest.fixture
+def e2e_audit_entries(monkeypatch) -> defaultdict[str, list[dict]]:
+    """Audit entries written by the webhook receiver during one test.
+
+    Entries are still written to the audit log as usual; the lines each call
+    appends are read back from the log file and recorded here keyed by
+    delivery ID, so tests check what was actually written without re-reading
+    the whole day's JSONL file.
+    """
+    from app.webhook_audit import get_auditor, log_webhook
+
+    entries: defaultdict[str, list[dict]] = defaultdict(list)
+
+    def _record(
+        delivery_id: str,
+        event_type: str,
+        headers: dict[str, str],
+        payload: dict | bytes,
+        metadata: dict | None = None,
+        received_at: datetime | None = None,
+    ) -> None:
+        received_at = received_at or datetime.utcnow()
+        log_file = get_auditor()._get_log_file(received_at.date())
+        offset = log_file.stat().st_size if log_file.exists() else 0
+
+        log_webhook(delivery_id, event_type, headers, payload, metadata, received_at)
+
+        with log_file.open("rb") as f:
+            f.seek(offset)
+            for line in f:
+                entry = json.loads(line)
+                entries[entry["delivery_id"]].append(entry)
+
+    monkeypatch.setattr("app.webhook_receiver.log_webhook", _record)
+    return entries
+
+
+@pytest.fixture(scope="session")
 def e2e_headers_for_pr():
     """Standard headers for PR webhook e2e tests."""
-    return lambda delivery_id: {
-        "X-GitHub-Event": "pull_request",
-        "X-GitHub-Delivery": delivery_id,
-        "Content-Type": "application/json",
-        "User-Agent": "GitHub-Hookshot/test",
-    }
+    return lambda delivery_id: {**_PR_HEADERS_BASE, "X-GitHub-Delivery": delivery_id}
 
 
-@pytest.fixture
+@pytest.fixture(scope="session")
 def e2e_headers_for_push():
     """Standard headers for push webhook e2e tests."""
-    return lambda delivery_id: {
-        "X-GitHub-Event": "push",
-        "X-GitHub-Delivery": delivery_id,
-        "Content-Type": "application/json",
-        "User-Agent": "GitHub-Hookshot/test",
-    }
+    return lambda delivery_id: {**_PUSH_HEADERS_BASE, "X-GitHub-Delivery": delivery_id}
@@ -4,207 +4,88 @@ Tests complete flows from webhook receipt through processing, audit logging,
 and metrics recording. All scenarios use obviously fake repository names.
 """
 
-import json
-from datetime import date
-from pathlib import Path
+from app.metrics import deployments_total, pr_total
 
-import pytest
 
-from app.metrics import deployments_total, pr_review_time_seconds, pr_total
+# Expected (pr_number, merged label, delivery ID, response status) for each
+# PR action; closed PRs are recorded in metrics but not analyzed
+_PR_EXPECTATIONS = {
+    "opened": (42, "false", "e2e-test-pr-opened-skynet-001", "processing"),
+    "closed": (42, "true", "e2e-test-pr-merged-skynet-002", "ignored"),
+    "synchronize": (99, "false", "e2e-test-pr-synchronized-works-003", "processing"),
+}
 
 
 class TestE2EPRHappyPath:
     """E2E happy path tests for pull request webhooks."""
 
-    def test_pr_opened_complete_flow(
+    def test_pr_complete_flow(
         self,
         client,
-        e2e_pr_opened_payload,
-        e2e_compute_signature,
+        e2e_pr_payload,
+        e2e_signed_payload,
         e2e_headers_for_pr,
+        e2e_audit_entries,
+        e2e_metric_delta,
     ):
-        """E2E: Complete flow for PR opened webhook.
+        """E2E: Complete flow for each PR webhook action.
 
-        Repo: octocat/definitely-not-skynet
-        PR #42: "Add AI sentience (totally safe)"
+        Runs once per action:
+        - opened: octocat/definitely-not-skynet PR #42 "Add AI sentience (totally safe)"
+        - closed: the same PR #42 merged after 2.5 hours
+        - synchronize: senior-dev/works-on-my-machine PR #99 force push to hotfix branch
 
         Verifies:
-        1. HTTP 200 response with correct status
+        1. HTTP 200 response with the expected status (closed PRs are ignored)
         2. Audit log entry created
-        3. PR metrics incremented
-        4. Response contains delivery ID
+        3. PR metrics incremented with the right action and merged labels
+        4. Analyzed actions echo the action and delivery ID
         """
         # Arrange
-        delivery_id = "e2e-test-pr-opened-skynet-001"
+        action = e2e_pr_payload["action"]
+        pr_number, merged, delivery_id, status = _PR_EXPECTATIONS[action]
 
-        # Serialize payload once to ensure signature matches request body
-        import json
-        payload_json = json.dumps(e2e_pr_opened_payload, separators=(",", ":"), sort_keys=True)
-
-        signature = e2e_compute_signature(e2e_pr_opened_payload)
+        # Post exactly the bytes that were signed
+        payload_bytes, signature = e2e_signed_payload(e2e_pr_payload)
         headers = e2e_headers_for_pr(delivery_id)
         headers["X-Hub-Signature-256"] = signature
-        headers["Content-Type"] = "application/json"
 
-        repo_name = e2e_pr_opened_payload["repository"]["full_name"]
-        initial_pr_count = pr_total.labels(
-            repository=repo_name, action="opened", merged="false"
-        )._value.get()
+        repo_name = e2e_pr_payload["repository"]["full_name"]
 
         # Act
-        response = client.post(
-            "/webhook/github", data=payload_json, headers=headers
-        )
+        with e2e_metric_delta(
+            pr_total, repository=repo_name, action=action, merged=merged
+        ) as pr_delta:
+            response = client.post(
+                "/webhook/github", content=payload_bytes, headers=headers
+            )
 
         # Assert
         assert response.status_code == 200
         response_data = response.json()
 
         # Verify response data
-        assert response_data["status"] == "processing"
-        assert response_data["pr_number"] == 42
-        assert response_data["action"] == "opened"
-        assert response_data["delivery_id"] == delivery_id
-
-        # Verify metrics incremented (with retry since background task is async)
-        import time
-        max_wait = 3  # seconds
-        start_time = time.time()
-        while time.time() - start_time < max_wait:
-            new_pr_count = pr_total.labels(
-                repository=repo_name, action="opened", merged="false"
-            )._value.get()
-            if new_pr_count == initial_pr_count + 1:
-                break
-            time.sleep(0.1)
+        assert response_data["status"] == status
+        assert response_data["pr_number"] == pr_number
+        if status == "processing":
+            assert response_data["action"] == action
+            assert response_data["delivery_id"] == delivery_id
         else:
-            # If we got here, metrics weren't incremented in time
-            pytest.fail(f"Metrics not incremented after {max_wait}s. Expected {initial_pr_count + 1}, got {new_pr_count}")
-
-        assert new_pr_count == initial_pr_count + 1
-
-        # Verify audit log exists
-        audit_log_file = Path(f"logs/webhooks/webhooks-{date.today().isoformat()}.jsonl")
-        if audit_log_file.exists():
-            # Read audit log and verify entry exists
-            with open(audit_log_file, "r") as f:
-                log_entries = [json.loads(line) for line in f if line.strip()]
-                matching_entries = [
-                    entry
-                    for entry in log_entries
-                    if entry.get("delivery_id") == delivery_id
-                ]
-                assert (
-                    len(matching_entries) >= 1
-                ), f"Expected at least 1 audit entry, found {len(matching_entries)}"
-
-                entry = matching_entries[0]
-                assert entry["event_type"] == "pull_request"
-                assert entry["payload"]["number"] == 42
-                assert entry["payload"]["repository"]["full_name"] == repo_name
-
-    def test_pr_merged_complete_flow(
-        self,
-        client,
-        e2e_pr_merged_payload,
-        e2e_compute_signature,
-        e2e_headers_for_pr,
-    ):
-        """E2E: Complete flow for PR merged webhook.
-
-        Repo: octocat/definitely-not-skynet
-        PR #42 merged after 2.5 hours
-
-        Verifies:
-        1. HTTP 200 response
-        2. Audit log entry
-        3. PR metrics show merged=true
-        4. PR review time recorded
-        """
-        # Arrange
-        delivery_id = "e2e-test-pr-merged-skynet-002"
-        signature = e2e_compute_signature(e2e_pr_merged_payload)
-        headers = e2e_headers_for_pr(delivery_id)
-        headers["X-Hub-Signature-256"] = signature
-
-        repo_name = e2e_pr_merged_payload["repository"]["full_name"]
-
-        # Get initial metrics
-        initial_merged_count = pr_total.labels(
-            repository=repo_name, action="closed", merged="true"
-        )._value.get()
-
-        # Act
-        response = client.post(
-            "/webhook/github", json=e2e_pr_merged_payload, headers=headers
-        )
-
-        # Assert
-        assert response.status_code == 200
-        response_data = response.json()
-
-        # Verify response
-        assert response_data["status"] == "processing"
-        assert response_data["pr_number"] == 42
-        assert response_data["action"] == "closed"
-
-        # Verify merged PR metric incremented
-        new_merged_count = pr_total.labels(
-            repository=repo_name, action="closed", merged="true"
-        )._value.get()
-        assert new_merged_count == initial_merged_count + 1
+            assert f"'{action}' does not require analysis" in response_data["message"]
 
-        # Verify review time was recorded (histogram should have data)
-        # Note: Can't easily verify exact value, but we can verify it was called
-        # by checking that another observation increases the count
+        # Verify metrics incremented (recorded before the response is sent)
+        assert pr_delta() == 1
 
-    def test_pr_synchronized_complete_flow(
-        self,
-        client,
-        e2e_pr_synchronized_payload,
-        e2e_compute_signature,
-        e2e_headers_for_pr,
-    ):
-        """E2E: Complete flow for PR synchronized webhook.
-
-        Repo: senior-dev/works-on-my-machine
-        PR #99: Force push to hotfix branch
-
-        Verifies:
-        1. HTTP 200 response
-        2. Metrics recorded for synchronize action
-        3. Audit log captured
-        """
-        # Arrange
-        delivery_id = "e2e-test-pr-synchronized-works-003"
-        signature = e2e_compute_signature(e2e_pr_synchronized_payload)
-        headers = e2e_headers_for_pr(delivery_id)
-        headers["X-Hub-Signature-256"] = signature
-
-        repo_name = e2e_pr_synchronized_payload["repository"]["full_name"]
-        initial_sync_count = pr_total.labels(
-            repository=repo_name, action="synchronize", merged="false"
-        )._value.get()
-
-        # Act
-        response = client.post(
-            "/webhook/github", json=e2e_pr_synchronized_payload, headers=headers
-        )
-
-        # Assert
-        assert response.status_code == 200
-        response_data = response.json()
-
-        # Verify response
-        assert response_data["status"] == "processing"
-        assert response_data["pr_number"] == 99
-        assert response_data["action"] == "synchronize"
+        # Verify audit log entry
+        matching_entries = e2e_audit_entries[delivery_id]
+        assert (
+            len(matching_entries) >= 1
+        ), f"Expected at least 1 audit entry, found {len(matching_entries)}"
 
-        # Verify synchronize metric incremented
-        new_sync_count = pr_total.labels(
-            repository=repo_name, action="synchronize", merged="false"
-        )._value.get()
-        assert new_sync_count == initial_sync_count + 1
+        entry = matching_entries[0]
+        assert entry["event_type"] == "pull_request"
+        assert entry["payload"]["number"] == pr_number
+        assert entry["payload"]["repository"]["full_name"] == repo_name
 
 
 class TestE2EPushHappyPath:
@@ -214,8 +95,10 @@ class TestE2EPushHappyPath:
         self,
         client,
         e2e_push_to_main_payload,
-        e2e_compute_signature,
+        e2e_signed_payload,
         e2e_headers_for_push,
+        e2e_audit_entries,
+        e2e_metric_delta,
     ):
         """E2E: Complete flow for push to main branch.
 
@@ -230,19 +113,19 @@ class TestE2EPushHappyPath:
         """
         # Arrange
         delivery_id = "e2e-test-push-main-works-004"
-        signature = e2e_compute_signature(e2e_push_to_main_payload)
+        payload_bytes, signature = e2e_signed_payload(e2e_push_to_main_payload)
         headers = e2e_headers_for_push(delivery_id)
         headers["X-Hub-Signature-256"] = signature
 
         repo_name = e2e_push_to_main_payload["repository"]["full_name"]
-        initial_deploy_count = deployments_total.labels(
-            repository=repo_name, environment="production", status="success"
-        )._value.get()
 
         # Act
-        response = client.post(
-            "/webhook/github", json=e2e_push_to_main_payload, headers=headers
-        )
+        with e2e_metric_delta(
+            deployments_total, repository=repo_name, environment="production", status="success"
+        ) as deploy_delta:
+            response = client.post(
+                "/webhook/github", content=payload_bytes, headers=headers
+            )
 
         # Assert
         assert response.status_code == 200
@@ -254,55 +137,47 @@ class TestE2EPushHappyPath:
         assert response_data["commits"] == 3
 
         # Verify deployment metric incremented
-        new_deploy_count = deployments_total.labels(
-            repository=repo_name, environment="production", status="success"
-        )._value.get()
-        assert new_deploy_count == initial_deploy_count + 1
-
-        # Verify audit log exists
-        audit_log_file = Path(f"logs/webhooks/webhooks-{date.today().isoformat()}.jsonl")
-        if audit_log_file.exists():
-            with open(audit_log_file, "r") as f:
-                log_entries = [json.loads(line) for line in f if line.strip()]
-                matching_entries = [
-                    entry
-                    for entry in log_entries
-                    if entry.get("delivery_id") == delivery_id
-                ]
-                assert len(matching_entries) == 1
-
-                entry = matching_entries[0]
-                assert entry["event_type"] == "push"
-                assert entry["payload"]["ref"] == "refs/heads/main"
-                assert len(entry["payload"]["commits"]) == 3
+        assert deploy_delta() == 1
+
+        # Verify audit log entry
+        matching_entries = e2e_audit_entries[delivery_id]
+        assert len(matching_entries) == 1
+
+        entry = matching_entries[0]
+        assert entry["event_type"] == "push"
+        assert entry["payload"]["ref"] == "refs/heads/main"
+        assert len(entry["payload"]["commits"]) == 3
 
     def test_push_to_feature_branch_ignores_deployment(
         self,
         client,
         e2e_push_to_main_payload,
-        e2e_compute_signature,
+        e2e_signed_payload,
         e2e_headers_for_push,
+        e2e_metric_delta,
     ):
         """E2E: Push to feature branch doesn't record deployment.
 
         Verifies that only pushes to main/master trigger deployment metrics.
         """
         # Arrange - modify payload to be a feature branch
-        feature_payload = e2e_push_to_main_payload.copy()
-        feature_payload["ref"] = "refs/heads/feature/not-a-deployment"
+        feature_payload = {
+            **e2e_push_to_main_payload,
+            "ref": "refs/heads/feature/not-a-deployment",
+        }
 
         delivery_id = "e2e-test-push-feature-005"
-        signature = e2e_compute_signature(feature_payload)
+        payload_bytes, signature = e2e_signed_payload(feature_payload)
         headers = e2e_headers_for_push(delivery_id)
         headers["X-Hub-Signature-256"] = signature
 
         repo_name = feature_payload["repository"]["full_name"]
-        initial_deploy_count = deployments_total.labels(
-            repository=repo_name, environment="production", status="success"
-        )._value.get()
 
         # Act
-        response = client.post("/webhook/github", json=feature_payload, headers=headers)
+        with e2e_metric_delta(
+            deployments_total, repository=repo_name, environment="production", status="success"
+        ) as deploy_delta:
+            response = client.post("/webhook/github", content=payload_bytes, headers=headers)
 
         # Assert
         assert response.status_code == 200
@@ -312,7 +187,4 @@ class TestE2EPushHappyPath:
         assert "feature/not-a-deployment" in response_data.get("branch", "")
 
         # Verify deployment metric NOT incremented
-        new_deploy_count = deployments_total.labels(
-            repository=repo_name, environment="production", status="success"
-        )._value.get()
-        assert new_deploy_count == initial_deploy_count, "Feature branch should not trigger deployment metric"
+        assert deploy_delta() == 0, "Feature branch should not trigger deployment metric"
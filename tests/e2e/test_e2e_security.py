@@ -4,14 +4,6 @@ Tests complete security flows verifying that security violations
 are properly rejected and don't leak into audit logs or metrics.
 """
 
-import hashlib
-import hmac
-import json
-from datetime import date
-from pathlib import Path
-
-import pytest
-
 from app.metrics import pr_total
 
 
@@ -22,7 +14,10 @@ class TestE2ESecurityRejection:
         self,
         client,
         e2e_pr_opened_payload,
+        e2e_pr_opened_bytes,
         e2e_headers_for_pr,
+        e2e_audit_entries,
+        e2e_metric_delta,
     ):
         """E2E: Invalid signature is completely rejected.
 
@@ -38,42 +33,34 @@ class TestE2ESecurityRejection:
         headers["X-Hub-Signature-256"] = "sha256=invalid_signature_here"
 
         repo_name = e2e_pr_opened_payload["repository"]["full_name"]
-        initial_pr_count = pr_total.labels(
-            repository=repo_name, action="opened", merged="false"
-        )._value.get()
 
         # Act
-        response = client.post(
-            "/webhook/github", json=e2e_pr_opened_payload, headers=headers
-        )
+        with e2e_metric_delta(
+            pr_total, repository=repo_name, action="opened", merged="false"
+        ) as pr_delta:
+            response = client.post(
+                "/webhook/github", content=e2e_pr_opened_bytes, headers=headers
+            )
 
         # Assert
         assert response.status_code == 401
         assert "webhook signature" in response.json()["detail"].lower()
 
         # Verify metrics NOT incremented
-        new_pr_count = pr_total.labels(
-            repository=repo_name, action="opened", merged="false"
-        )._value.get()
-        assert new_pr_count == initial_pr_count, "Metrics should not increment on invalid signature"
-
-        # Verify NO audit log entry (audit logs are created before signature validation fails)
-        # This is actually tricky - the audit log SHOULD be created since we log before validation
-        # Let's verify the audit log shows the rejection if it exists
-        audit_log_file = Path(f"logs/webhooks/webhooks-{date.today().isoformat()}.jsonl")
-        if audit_log_file.exists():
-            with open(audit_log_file, "r") as f:
-                log_entries = [json.loads(line) for line in f if line.strip()]
-                # If audit logging happens before signature check, entry exists
-                # If after, entry doesn't exist
-                # Current implementation logs AFTER validation, so no entry expected
+        assert pr_delta() == 0, "Metrics should not increment on invalid signature"
+
+        # Verify NO audit log entry (the request is audited only after the
+        # signature has been verified)
+        assert delivery_id not in e2e_audit_entries
 
     def test_tampered_payload_rejection(
         self,
         client,
         e2e_pr_opened_payload,
-        e2e_compute_signature,
+        e2e_payload_bytes,
+        e2e_pr_opened_signature,
         e2e_headers_for_pr,
+        e2e_metric_delta,
     ):
         """E2E: Tampered payload is rejected.
 
@@ -88,38 +75,38 @@ class TestE2ESecurityRejection:
         delivery_id = "e2e-security-tampered-002"
 
         # Create signature for original payload
-        original_signature = e2e_compute_signature(e2e_pr_opened_payload)
+        original_signature = e2e_pr_opened_signature
 
         # Tamper with the payload
-        tampered_payload = e2e_pr_opened_payload.copy()
-        tampered_payload["number"] = 666  # Change PR number
+        tampered_payload = {**e2e_pr_opened_payload, "number": 666}  # Change PR number
 
         # Send tampered payload with original signature
         headers = e2e_headers_for_pr(delivery_id)
         headers["X-Hub-Signature-256"] = original_signature
 
         repo_name = tampered_payload["repository"]["full_name"]
-        initial_pr_count = pr_total.labels(
-            repository=repo_name, action="opened", merged="false"
-        )._value.get()
 
         # Act
-        response = client.post("/webhook/github", json=tampered_payload, headers=headers)
+        with e2e_metric_delta(
+            pr_total, repository=repo_name, action="opened", merged="false"
+        ) as pr_delta:
+            response = client.post(
+                "/webhook/github", content=e2e_payload_bytes(tampered_payload), headers=headers
+            )
 
         # Assert
         assert response.status_code == 401
 
         # Verify metrics NOT incremented
-        new_pr_count = pr_total.labels(
-            repository=repo_name, action="opened", merged="false"
-        )._value.get()
-        assert new_pr_count == initial_pr_count
+        assert pr_delta() == 0
 
     def test_missing_required_headers_rejection(
         self,
         client,
         e2e_pr_opened_payload,
-        e2e_compute_signature,
+        e2e_pr_opened_bytes,
+        e2e_pr_opened_signature,
+        e2e_metric_delta,
     ):
         """E2E: Missing required headers returns 422.
 
@@ -129,7 +116,7 @@ class TestE2ESecurityRejection:
         3. NO metrics incremented
         """
         # Arrange
-        signature = e2e_compute_signature(e2e_pr_opened_payload)
+        signature = e2e_pr_opened_signature
 
         # Send with missing X-GitHub-Delivery header
         headers = {
@@ -139,23 +126,20 @@ class TestE2ESecurityRejection:
         }
 
         repo_name = e2e_pr_opened_payload["repository"]["full_name"]
-        initial_pr_count = pr_total.labels(
-            repository=repo_name, action="opened", merged="false"
-        )._value.get()
 
         # Act
-        response = client.post(
-            "/webhook/github", json=e2e_pr_opened_payload, headers=headers
-        )
+        with e2e_metric_delta(
+            pr_total, repository=repo_name, action="opened", merged="false"
+        ) as pr_delta:
+            response = client.post(
+                "/webhook/github", content=e2e_pr_opened_bytes, headers=headers
+            )
 
         # Assert
         assert response.status_code == 422  # FastAPI validation error
 
         # Verify metrics NOT incremented
-        new_pr_count = pr_total.labels(
-            repository=repo_name, action="opened", merged="false"
-        )._value.get()
-        assert new_pr_count == initial_pr_count
+        assert pr_delta() == 0
 
     def test_invalid_json_rejection(
         self,
@@ -191,7 +175,9 @@ class TestE2ESecurityRejection:
         self,
         client,
         e2e_pr_opened_payload,
-        e2e_compute_signature,
+        e2e_pr_opened_bytes,
+        e2e_pr_opened_signature,
+        e2e_metric_delta,
     ):
         """E2E: Unsupported event type is ignored gracefully.
 
@@ -204,7 +190,7 @@ class TestE2ESecurityRejection:
         """
         # Arrange
         delivery_id = "e2e-security-unsupported-event-004"
-        signature = e2e_compute_signature(e2e_pr_opened_payload)
+        signature = e2e_pr_opened_signature
 
         # Send with unsupported event type
         headers = {
@@ -214,14 +200,14 @@ class TestE2ESecurityRejection:
         }
 
         repo_name = e2e_pr_opened_payload["repository"]["full_name"]
-        initial_pr_count = pr_total.labels(
-            repository=repo_name, action="opened", merged="false"
-        )._value.get()
 
         # Act
-        response = client.post(
-            "/webhook/github", json=e2e_pr_opened_payload, headers=headers
-        )
+        with e2e_metric_delta(
+            pr_total, repository=repo_name, action="opened", merged="false"
+        ) as pr_delta:
+            response = client.post(
+                "/webhook/github", content=e2e_pr_opened_bytes, headers=headers
+            )
 
         # Assert
         assert response.status_code == 200
@@ -230,10 +216,7 @@ class TestE2ESecurityRejection:
         assert "issues" in response_data["message"].lower()
 
         # Verify metrics NOT incremented
-        new_pr_count = pr_total.labels(
-            repository=repo_name, action="opened", merged="false"
-        )._value.get()
-        assert new_pr_count == initial_pr_count
+        assert pr_delta() == 0
 
 
 class TestE2ESecurityEdgeCases:
@@ -243,7 +226,9 @@ class TestE2ESecurityEdgeCases:
         self,
         client,
         e2e_pr_opened_payload,
+        e2e_pr_opened_bytes,
         e2e_headers_for_pr,
+        e2e_metric_delta,
     ):
         """E2E: Signature without 'sha256=' prefix is rejected.
 
@@ -259,30 +244,29 @@ class TestE2ESecurityEdgeCases:
         headers["X-Hub-Signature-256"] = "just_a_hash_no_prefix"
 
         repo_name = e2e_pr_opened_payload["repository"]["full_name"]
-        initial_pr_count = pr_total.labels(
-            repository=repo_name, action="opened", merged="false"
-        )._value.get()
 
         # Act
-        response = client.post(
-            "/webhook/github", json=e2e_pr_opened_payload, headers=headers
-        )
+        with e2e_metric_delta(
+            pr_total, repository=repo_name, action="opened", merged="false"
+        ) as pr_delta:
+            response = client.post(
+                "/webhook/github", content=e2e_pr_opened_bytes, headers=headers
+            )
 
         # Assert
         assert response.status_code == 401
 
         # Verify metrics NOT incremented
-        new_pr_count = pr_total.labels(
-            repository=repo_name, action="opened", merged="false"
-        )._value.get()
-        assert new_pr_count == initial_pr_count
+        assert pr_delta() == 0
 
     def test_replay_attack_same_delivery_id(
         self,
         client,
         e2e_pr_opened_payload,
-        e2e_compute_signature,
+        e2e_pr_opened_bytes,
+        e2e_pr_opened_signature,
         e2e_headers_for_pr,
+        e2e_metric_delta,
     ):
         """E2E: Same webhook delivered twice (replay attack).
 
@@ -294,32 +278,29 @@ class TestE2ESecurityEdgeCases:
         """
         # Arrange
         delivery_id = "e2e-security-replay-006"
-        signature = e2e_compute_signature(e2e_pr_opened_payload)
+        signature = e2e_pr_opened_signature
         headers = e2e_headers_for_pr(delivery_id)
         headers["X-Hub-Signature-256"] = signature
 
         repo_name = e2e_pr_opened_payload["repository"]["full_name"]
-        initial_pr_count = pr_total.labels(
-            repository=repo_name, action="opened", merged="false"
-        )._value.get()
 
         # Act - Send webhook twice
-        response1 = client.post(
-            "/webhook/github", json=e2e_pr_opened_payload, headers=headers
-        )
-        response2 = client.post(
-            "/webhook/github", json=e2e_pr_opened_payload, headers=headers
-        )
+        with e2e_metric_delta(
+            pr_total, repository=repo_name, action="opened", merged="false"
+        ) as pr_delta:
+            response1 = client.post(
+                "/webhook/github", content=e2e_pr_opened_bytes, headers=headers
+            )
+            response2 = client.post(
+                "/webhook/github", content=e2e_pr_opened_bytes, headers=headers
+            )
 
         # Assert - Both succeed (no replay protection currently)
         assert response1.status_code == 200
         assert response2.status_code == 200
 
         # Metrics incremented twice (current behavior)
-        new_pr_count = pr_total.labels(
-            repository=repo_name, action="opened", merged="false"
-        )._value.get()
-        assert new_pr_count == initial_pr_count + 2
+        assert pr_delta() == 2
 
         # TODO: When replay protection is added, update this test to expect:
         # - First request: 200 OK
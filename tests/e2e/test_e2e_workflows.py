@@ -4,11 +4,195 @@ Tests complete PR workflows from opened → synchronized → merged,
 verifying state consistency across multiple webhook deliveries.
 """
 
-from datetime import datetime, timedelta, timezone
-
-import pytest
-
-from app.metrics import pr_review_time_seconds, pr_total
+import functools
+from types import MappingProxyType
+
+from app.metrics import pr_total
+from tests.helpers import build_user
+
+
+# PR author and sender; the base side of each PR belongs to the repo owner
+_DEVELOPER = build_user("developer", 123)
+
+# Pull request fields shared by every payload in this module
+_BASE_PULL_REQUEST = MappingProxyType(
+    {
+        "user": _DEVELOPER,
+        "body": "Test PR body",
+        "draft": False,
+    }
+)
+
+# Fixed timestamps; tests only depend on their ordering and spacing
+_NOW = "2025-01-15T12:00:00+00:00"
+_ONE_HOUR_AGO = "2025-01-15T11:00:00+00:00"
+_TWO_HOURS_AGO = "2025-01-15T10:00:00+00:00"
+_THREE_HOURS_AGO = "2025-01-15T09:00:00+00:00"
+
+
+@functools.cache
+def _pr_strings(pr_number):
+    """Title, head ref and head SHA derived from a PR number.
+
+    Args:
+        pr_number: Pull request number
+
+    Returns:
+        tuple: (title, head ref, head SHA)
+    """
+    return f"Add feature #{pr_number}", f"feature/pr-{pr_number}", f"{pr_number:0>40}"
+
+
+def _pr_event(action, repo, pr_number, *, extra=None, **pull_request_fields):
+    """Build a pull_request event for the given repository.
+
+    Args:
+        action: PR action (opened, synchronize, closed)
+        repo: Repository payload the PR belongs to
+        pr_number: Pull request number
+        extra: Additional top-level event fields (e.g. before/after)
+        **pull_request_fields: Fields set on (or overriding) the pull_request
+
+    Returns:
+        dict: Webhook payload
+    """
+    title, head_ref, head_sha = _pr_strings(pr_number)
+    full_name = repo["full_name"]
+    owner = repo["owner"]
+    return {
+        "action": action,
+        "number": pr_number,
+        **(extra or {}),
+        "pull_request": {
+            **_BASE_PULL_REQUEST,
+            "id": pr_number * 1000,
+            "number": pr_number,
+            "title": title,
+            "html_url": f"https://github.com/{full_name}/pull/{pr_number}",
+            "diff_url": f"https://github.com/{full_name}/pull/{pr_number}.diff",
+            "patch_url": f"https://github.com/{full_name}/pull/{pr_number}.patch",
+            "head": {
+                "label": f"{_DEVELOPER['login']}:{head_ref}",
+                "ref": head_ref,
+                "sha": head_sha,
+                "user": _DEVELOPER,
+            },
+            "base": {
+                "label": f"{owner['login']}:main",
+                "ref": "main",
+                "sha": "b" * 40,
+                "user": owner,
+            },
+            **pull_request_fields,
+        },
+        "repository": repo,
+        "sender": _DEVELOPER,
+    }
+
+
+def _create_pr_opened(repo, created_at, pr_number=42):
+    """Create PR opened payload."""
+    return _pr_event(
+        "opened",
+        repo,
+        pr_number,
+        state="open",
+        created_at=created_at,
+        updated_at=created_at,
+        closed_at=None,
+        merged_at=None,
+        merge_commit_sha=None,
+        merged=False,
+        commits=1,
+        additions=100,
+        deletions=10,
+        changed_files=2,
+    )
+
+
+def _create_pr_synchronized(repo, created_at):
+    """Create PR synchronized payload."""
+    return _pr_event(
+        "synchronize",
+        repo,
+        42,
+        extra={"before": "a" * 40, "after": "c" * 40},
+        state="open",
+        created_at=created_at,
+        updated_at=_NOW,
+        closed_at=None,
+        merged_at=None,
+        head={
+            "label": f"{_DEVELOPER['login']}:feature/pr-42",
+            "ref": "feature/pr-42",
+            "sha": "c" * 40,
+            "user": _DEVELOPER,
+        },
+        merged=False,
+        commits=2,
+        additions=150,
+        deletions=20,
+        changed_files=3,
+    )
+
+
+def _create_pr_merged(repo, created_at, merged_at, pr_number=42):
+    """Create PR merged payload."""
+    return _pr_event(
+        "closed",
+        repo,
+        pr_number,
+        state="closed",
+        created_at=created_at,
+        updated_at=merged_at,
+        closed_at=merged_at,
+        merged_at=merged_at,
+        merge_commit_sha="m" * 40,
+        merged=True,
+        merged_by=repo["owner"],
+        commits=2,
+        additions=150,
+        deletions=20,
+        changed_files=3,
+    )
+
+
+def _create_pr_closed_unmerged(repo, created_at, pr_number=42):
+    """Create PR closed without merge payload."""
+    return _pr_event(
+        "closed",
+        repo,
+        pr_number,
+        state="closed",
+        created_at=created_at,
+        updated_at=_NOW,
+        closed_at=_NOW,
+        merged_at=None,
+        merge_commit_sha=None,
+        merged=False,
+        commits=1,
+        additions=100,
+        deletions=10,
+        changed_files=2,
+    )
+
+
+def _send_webhook(client, payload, delivery_id, sign, headers_func):
+    """Send a PR webhook with proper signature and headers.
+
+    Args:
+        client: Test client
+        payload: Webhook payload dictionary
+        delivery_id: Value for X-GitHub-Delivery
+        sign: e2e_signed_payload helper
+        headers_func: Builds the base headers for a delivery ID
+
+    Returns:
+        Response from the webhook endpoint
+    """
+    payload_bytes, signature = sign(payload)
+    headers = {**headers_func(delivery_id), "X-Hub-Signature-256": signature}
+    return client.post("/webhook/github", content=payload_bytes, headers=headers)
 
 
 class TestE2ECompleteWorkflow:
@@ -18,7 +202,7 @@ class TestE2ECompleteWorkflow:
         self,
         client,
         e2e_skynet_repo,
-        e2e_compute_signature,
+        e2e_signed_payload,
         e2e_headers_for_pr,
     ):
         """E2E: Complete PR lifecycle from opened to merged.
@@ -33,49 +217,45 @@ class TestE2ECompleteWorkflow:
         """
         repo_name = e2e_skynet_repo["full_name"]
 
-        # Get initial metrics
-        initial_opened = pr_total.labels(
-            repository=repo_name, action="opened", merged="false"
-        )._value.get()
-        initial_sync = pr_total.labels(
-            repository=repo_name, action="synchronize", merged="false"
-        )._value.get()
-        initial_merged = pr_total.labels(
-            repository=repo_name, action="closed", merged="true"
-        )._value.get()
+        # Bind each (action, merged) counter once and snapshot its starting value
+        counters = {
+            (action, merged): pr_total.labels(repository=repo_name, action=action, merged=merged)
+            for action, merged in (
+                ("opened", "false"),
+                ("synchronize", "false"),
+                ("closed", "true"),
+            )
+        }
+        initial = {key: counter._value.get() for key, counter in counters.items()}
 
         # Step 1: PR Opened
-        created_at = datetime.now(timezone.utc) - timedelta(hours=3)
-        pr_opened = self._create_pr_opened(e2e_skynet_repo, created_at)
+        created_at = _THREE_HOURS_AGO
+        pr_opened = _create_pr_opened(e2e_skynet_repo, created_at)
 
-        response = self._send_webhook(
+        response = _send_webhook(
             client,
             pr_opened,
             "e2e-workflow-opened-001",
-            e2e_compute_signature,
+            e2e_signed_payload,
             e2e_headers_for_pr,
         )
 
         assert response.status_code == 200
-        assert response.json()["status"] == "processing"
-        assert response.json()["pr_number"] == 42
+        response_data = response.json()
+        assert response_data["status"] == "processing"
+        assert response_data["pr_number"] == 42
 
         # Verify opened metric incremented
-        assert (
-            pr_total.labels(repository=repo_name, action="opened", merged="false")._value.get()
-            == initial_opened + 1
-        )
+        assert counters[("opened", "false")]._value.get() == initial[("opened", "false")] + 1
 
         # Step 2: PR Synchronized (force push)
-        pr_sync_1 = self._create_pr_synchronized(
-            e2e_skynet_repo, created_at, "force push: fixing typos"
-        )
+        pr_sync_1 = _create_pr_synchronized(e2e_skynet_repo, created_at)
 
-        response = self._send_webhook(
+        response = _send_webhook(
             client,
             pr_sync_1,
             "e2e-workflow-sync1-002",
-            e2e_compute_signature,
+            e2e_signed_payload,
             e2e_headers_for_pr,
         )
 
@@ -84,20 +264,17 @@ class TestE2ECompleteWorkflow:
 
         # Verify sync metric incremented (first time)
         assert (
-            pr_total.labels(repository=repo_name, action="synchronize", merged="false")._value.get()
-            == initial_sync + 1
+            counters[("synchronize", "false")]._value.get() == initial[("synchronize", "false")] + 1
         )
 
         # Step 3: PR Synchronized (new commits)
-        pr_sync_2 = self._create_pr_synchronized(
-            e2e_skynet_repo, created_at, "added tests (lol jk)"
-        )
+        pr_sync_2 = _create_pr_synchronized(e2e_skynet_repo, created_at)
 
-        response = self._send_webhook(
+        response = _send_webhook(
             client,
             pr_sync_2,
             "e2e-workflow-sync2-003",
-            e2e_compute_signature,
+            e2e_signed_payload,
             e2e_headers_for_pr,
         )
 
@@ -105,29 +282,25 @@ class TestE2ECompleteWorkflow:
 
         # Verify sync metric incremented again
         assert (
-            pr_total.labels(repository=repo_name, action="synchronize", merged="false")._value.get()
-            == initial_sync + 2
+            counters[("synchronize", "false")]._value.get() == initial[("synchronize", "false")] + 2
         )
 
         # Step 4: PR Merged
-        merged_at = datetime.now(timezone.utc)
-        pr_merged = self._create_pr_merged(e2e_skynet_repo, created_at, merged_at)
+        merged_at = _NOW
+        pr_merged = _create_pr_merged(e2e_skynet_repo, created_at, merged_at)
 
-        response = self._send_webhook(
+        response = _send_webhook(
             client,
             pr_merged,
             "e2e-workflow-merged-004",
-            e2e_compute_signature,
+            e2e_signed_payload,
             e2e_headers_for_pr,
         )
 
         assert response.status_code == 200
 
         # Verify merged metric incremented
-        assert (
-            pr_total.labels(repository=repo_name, action="closed", merged="true")._value.get()
-            == initial_merged + 1
-        )
+        assert counters[("closed", "true")]._value.get() == initial[("closed", "true")] + 1
 
         # Verify review time was recorded (3 hours)
         # Can't directly assert histogram value, but test that it didn't crash
@@ -137,7 +310,7 @@ class TestE2ECompleteWorkflow:
         client,
         e2e_skynet_repo,
         e2e_works_on_my_machine_repo,
-        e2e_compute_signature,
+        e2e_signed_payload,
         e2e_headers_for_pr,
     ):
         """E2E: Multiple PRs from different repos interleaved.
@@ -154,256 +327,85 @@ class TestE2ECompleteWorkflow:
         skynet_name = e2e_skynet_repo["full_name"]
         works_name = e2e_works_on_my_machine_repo["full_name"]
 
-        # Get initial metrics for both repos
-        skynet_initial = pr_total.labels(
-            repository=skynet_name, action="opened", merged="false"
-        )._value.get()
-        works_initial = pr_total.labels(
-            repository=works_name, action="opened", merged="false"
-        )._value.get()
+        # Bind each (repository, action, merged) counter once and snapshot it
+        counters = {
+            (repo, action, merged): pr_total.labels(repository=repo, action=action, merged=merged)
+            for repo, action, merged in (
+                (skynet_name, "opened", "false"),
+                (skynet_name, "closed", "false"),
+                (works_name, "opened", "false"),
+                (works_name, "closed", "true"),
+            )
+        }
+        initial = {key: counter._value.get() for key, counter in counters.items()}
 
         # PR #1 opened (skynet)
-        created_at_1 = datetime.now(timezone.utc) - timedelta(hours=2)
-        pr1_opened = self._create_pr_opened(e2e_skynet_repo, created_at_1, pr_number=1)
+        created_at_1 = _TWO_HOURS_AGO
+        pr1_opened = _create_pr_opened(e2e_skynet_repo, created_at_1, pr_number=1)
 
-        response = self._send_webhook(
+        response = _send_webhook(
             client,
             pr1_opened,
             "e2e-multi-pr1-opened-001",
-            e2e_compute_signature,
+            e2e_signed_payload,
             e2e_headers_for_pr,
         )
         assert response.status_code == 200
         assert response.json()["pr_number"] == 1
 
         # Verify skynet metric incremented
-        assert (
-            pr_total.labels(repository=skynet_name, action="opened", merged="false")._value.get()
-            == skynet_initial + 1
-        )
+        skynet_opened = (skynet_name, "opened", "false")
+        assert counters[skynet_opened]._value.get() == initial[skynet_opened] + 1
 
         # PR #2 opened (works-on-my-machine)
-        created_at_2 = datetime.now(timezone.utc) - timedelta(hours=1)
-        pr2_opened = self._create_pr_opened(
-            e2e_works_on_my_machine_repo, created_at_2, pr_number=2
-        )
+        created_at_2 = _ONE_HOUR_AGO
+        pr2_opened = _create_pr_opened(e2e_works_on_my_machine_repo, created_at_2, pr_number=2)
 
-        response = self._send_webhook(
+        response = _send_webhook(
             client,
             pr2_opened,
             "e2e-multi-pr2-opened-002",
-            e2e_compute_signature,
+            e2e_signed_payload,
             e2e_headers_for_pr,
         )
         assert response.status_code == 200
         assert response.json()["pr_number"] == 2
 
         # Verify works metric incremented
-        assert (
-            pr_total.labels(repository=works_name, action="opened", merged="false")._value.get()
-            == works_initial + 1
-        )
+        works_opened = (works_name, "opened", "false")
+        assert counters[works_opened]._value.get() == initial[works_opened] + 1
 
         # PR #2 merged (works-on-my-machine)
-        merged_at_2 = datetime.now(timezone.utc)
-        pr2_merged = self._create_pr_merged(
+        merged_at_2 = _NOW
+        pr2_merged = _create_pr_merged(
             e2e_works_on_my_machine_repo, created_at_2, merged_at_2, pr_number=2
         )
 
-        response = self._send_webhook(
+        response = _send_webhook(
             client,
             pr2_merged,
             "e2e-multi-pr2-merged-003",
-            e2e_compute_signature,
+            e2e_signed_payload,
             e2e_headers_for_pr,
         )
         assert response.status_code == 200
 
         # Verify works merged metric incremented
-        works_merged = pr_total.labels(
-            repository=works_name, action="closed", merged="true"
-        )._value.get()
-        assert works_merged > 0
+        works_merged = (works_name, "closed", "true")
+        assert counters[works_merged]._value.get() > 0
 
         # PR #1 closed without merge (skynet)
-        pr1_closed = self._create_pr_closed_unmerged(e2e_skynet_repo, created_at_1, pr_number=1)
+        pr1_closed = _create_pr_closed_unmerged(e2e_skynet_repo, created_at_1, pr_number=1)
 
-        response = self._send_webhook(
+        response = _send_webhook(
             client,
             pr1_closed,
             "e2e-multi-pr1-closed-004",
-            e2e_compute_signature,
+            e2e_signed_payload,
             e2e_headers_for_pr,
         )
         assert response.status_code == 200
 
         # Verify skynet closed-unmerged metric incremented
-        skynet_closed = pr_total.labels(
-            repository=skynet_name, action="closed", merged="false"
-        )._value.get()
-        assert skynet_closed > 0
-
-    # Helper methods to create payloads
-
-    def _send_webhook(self, client, payload, delivery_id, compute_sig, headers_func):
-        """Send webhook with proper signature and headers."""
-        signature = compute_sig(payload)
-        headers = headers_func(delivery_id)
-        headers["X-Hub-Signature-256"] = signature
-        return client.post("/webhook/github", json=payload, headers=headers)
-
-    def _create_pr_opened(self, repo, created_at, pr_number=42):
-        """Create PR opened payload."""
-        return {
-            "action": "opened",
-            "number": pr_number,
-            "pull_request": {
-                "id": pr_number * 1000,
-                "number": pr_number,
-                "state": "open",
-                "title": f"Add feature #{pr_number}",
-                "user": {"login": "developer", "id": 123},
-                "body": "Test PR body",
-                "created_at": created_at.isoformat(),
-                "updated_at": created_at.isoformat(),
-                "closed_at": None,
-                "merged_at": None,
-                "merge_commit_sha": None,
-                "head": {
-                    "ref": f"feature/pr-{pr_number}",
-                    "sha": str(pr_number) * 10,
-                    "user": {"login": "developer"},
-                },
-                "base": {
-                    "ref": "main",
-                    "sha": "b" * 40,
-                    "user": {"login": repo["owner"]["login"]},
-                },
-                "merged": False,
-                "draft": False,
-                "commits": 1,
-                "additions": 100,
-                "deletions": 10,
-                "changed_files": 2,
-            },
-            "repository": repo,
-            "sender": {"login": "developer", "id": 123},
-        }
-
-    def _create_pr_synchronized(self, repo, created_at, commit_msg="Updated PR"):
-        """Create PR synchronized payload."""
-        updated_at = datetime.now(timezone.utc)
-        return {
-            "action": "synchronize",
-            "number": 42,
-            "before": "a" * 40,
-            "after": "c" * 40,
-            "pull_request": {
-                "id": 42000,
-                "number": 42,
-                "state": "open",
-                "title": "Add feature #42",
-                "user": {"login": "developer", "id": 123},
-                "body": "Test PR body",
-                "created_at": created_at.isoformat(),
-                "updated_at": updated_at.isoformat(),
-                "closed_at": None,
-                "merged_at": None,
-                "head": {
-                    "ref": "feature/pr-42",
-                    "sha": "c" * 40,
-                    "user": {"login": "developer"},
-                },
-                "base": {
-                    "ref": "main",
-                    "sha": "b" * 40,
-                    "user": {"login": repo["owner"]["login"]},
-                },
-                "merged": False,
-                "draft": False,
-                "commits": 2,
-                "additions": 150,
-                "deletions": 20,
-                "changed_files": 3,
-            },
-            "repository": repo,
-            "sender": {"login": "developer", "id": 123},
-        }
-
-    def _create_pr_merged(self, repo, created_at, merged_at, pr_number=42):
-        """Create PR merged payload."""
-        return {
-            "action": "closed",
-            "number": pr_number,
-            "pull_request": {
-                "id": pr_number * 1000,
-                "number": pr_number,
-                "state": "closed",
-                "title": f"Add feature #{pr_number}",
-                "user": {"login": "developer", "id": 123},
-                "body": "Test PR body",
-                "created_at": created_at.isoformat(),
-                "updated_at": merged_at.isoformat(),
-                "closed_at": merged_at.isoformat(),
-                "merged_at": merged_at.isoformat(),
-                "merge_commit_sha": "m" * 40,
-                "head": {
-                    "ref": f"feature/pr-{pr_number}",
-                    "sha": str(pr_number) * 10,
-                    "user": {"login": "developer"},
-                },
-                "base": {
-                    "ref": "main",
-                    "sha": "b" * 40,
-                    "user": {"login": repo["owner"]["login"]},
-                },
-                "merged": True,
-                "merged_by": {"login": repo["owner"]["login"], "id": 1},
-                "draft": False,
-                "commits": 2,
-                "additions": 150,
-                "deletions": 20,
-                "changed_files": 3,
-            },
-            "repository": repo,
-            "sender": {"login": "developer", "id": 123},
-        }
-
-    def _create_pr_closed_unmerged(self, repo, created_at, pr_number=42):
-        """Create PR closed without merge payload."""
-        closed_at = datetime.now(timezone.utc)
-        return {
-            "action": "closed",
-            "number": pr_number,
-            "pull_request": {
-                "id": pr_number * 1000,
-                "number": pr_number,
-                "state": "closed",
-                "title": f"Add feature #{pr_number}",
-                "user": {"login": "developer", "id": 123},
-                "body": "Test PR body",
-                "created_at": created_at.isoformat(),
-                "updated_at": closed_at.isoformat(),
-                "closed_at": closed_at.isoformat(),
-                "merged_at": None,
-                "merge_commit_sha": None,
-                "head": {
-                    "ref": f"feature/pr-{pr_number}",
-                    "sha": str(pr_number) * 10,
-                    "user": {"login": "developer"},
-                },
-                "base": {
-                    "ref": "main",
-                    "sha": "b" * 40,
-                    "user": {"login": repo["owner"]["login"]},
-                },
-                "merged": False,
-                "draft": False,
-                "commits": 1,
-                "additions": 100,
-                "deletions": 10,
-                "changed_files": 2,
-            },
-            "repository": repo,
-            "sender": {"login": "developer", "id": 123},
-        }
+        skynet_closed = (skynet_name, "closed", "false")
+        assert counters[skynet_closed]._value.get() > 0
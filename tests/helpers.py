@@ -0,0 +1,113 @@
+"""Shared helpers for building webhook payloads and request bodies in tests.
+
+Plain functions rather than fixtures, so test modules and conftests can
+import them directly.
+"""
+
+import functools
+import hashlib
+import hmac
+import json
+
+from app.config import settings
+
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; fall back to the stdlib encoder
+    orjson = None
+
+# Webhook secret keyed once; signing copies the keyed HMAC, which skips
+# re-deriving the inner/outer pads per payload
+_WEBHOOK_HMAC = hmac.new(settings.github_webhook_secret.encode("utf-8"), digestmod=hashlib.sha256)
+
+# Signatures memoized by request body, so a body that is sent by several tests
+# is only hashed once per session
+_SIGNATURES: dict[bytes, str] = {}
+
+
+def dumps_payload(payload: dict) -> bytes:
+    """Serialize a webhook payload to a compact, key-sorted UTF-8 JSON body.
+
+    Both encoders produce identical bytes, so request bodies and signatures
+    don't depend on whether orjson is installed.
+
+    Args:
+        payload: Webhook payload dictionary
+
+    Returns:
+        bytes: JSON request body
+    """
+    if orjson is not None:
+        return orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+    return json.dumps(payload, separators=(",", ":"), sort_keys=True, ensure_ascii=False).encode(
+        "utf-8"
+    )
+
+
+def sign_payload(payload: dict | bytes) -> tuple[bytes, str]:
+    """Serialize a webhook payload and sign it with the test webhook secret.
+
+    Post the returned bytes with ``content=`` so the request body is exactly
+    what was signed. Signatures are memoized per body.
+
+    Args:
+        payload: Webhook payload dictionary, or an already serialized request
+            body, which is signed as-is
+
+    Returns:
+        tuple: (payload_bytes, signature in format "sha256=<hex_digest>")
+
+    Example:
+        ```python
+        payload_bytes, signature = sign_payload(payload)
+        client.post(
+            "/webhook/github",
+            content=payload_bytes,
+            headers={"X-Hub-Signature-256": signature, ...},
+        )
+        ```
+    """
+    payload_bytes = payload if isinstance(payload, bytes) else dumps_payload(payload)
+    signature = _SIGNATURES.get(payload_bytes)
+    if signature is None:
+        mac = _WEBHOOK_HMAC.copy()
+        mac.update(payload_bytes)
+        signature = _SIGNATURES[payload_bytes] = f"sha256={mac.hexdigest()}"
+    return payload_bytes, signature
+
+
+@functools.cache
+def build_user(login: str, user_id: int) -> dict:
+    """Build complete GitHub user object with all required fields.
+
+    Cached, so every payload shares one dict per user; treat it as read-only.
+
+    Args:
+        login: GitHub username
+        user_id: GitHub user ID
+
+    Returns:
+        dict: User object as sent in webhook payloads
+    """
+    return {
+        "login": login,
+        "id": user_id,
+        "node_id": f"U_kgDO{user_id}",
+        "avatar_url": f"https://avatars.githubusercontent.com/u/{user_id}?v=4",
+        "gravatar_id": "",
+        "url": f"https://api.github.com/users/{login}",
+        "html_url": f"https://github.com/{login}",
+        "followers_url": f"https://api.github.com/users/{login}/followers",
+        "following_url": f"https://api.github.com/users/{login}/following{{/other_user}}",
+        "gists_url": f"https://api.github.com/users/{login}/gists{{/gist_id}}",
+        "starred_url": f"https://api.github.com/users/{login}/starred{{/owner}}{{/repo}}",
+        "subscriptions_url": f"https://api.github.com/users/{login}/subscriptions",
+        "organizations_url": f"https://api.github.com/users/{login}/orgs",
+        "repos_url": f"https://api.github.com/users/{login}/repos",
+        "events_url": f"https://api.github.com/users/{login}/events{{/privacy}}",
+        "received_events_url": f"https://api.github.com/users/{login}/received_events",
+        "type": "User",
+        "user_view_type": "public",
+        "site_admin": False,
+    }
@@ -3,211 +3,243 @@
 Tests the full flow: webhook → metrics recording → metrics exposure.
 """
 
-import hmac
-import hashlib
-from datetime import datetime, timezone
+from types import MappingProxyType
 
 import pytest
 
 from app.metrics import deployments_total, pr_review_time_seconds, pr_total
+from tests.helpers import build_user, sign_payload
+
+
+_OWNER = build_user("test-org", 1001)
+_PUSHER = build_user("test-user", 1002)
+
+_REPOSITORY = {
+    "id": 2001,
+    "name": "test-repo",
+    "full_name": "test-org/test-repo",
+    "html_url": "https://github.com/test-org/test-repo",
+    "private": False,
+    "owner": _OWNER,
+    "default_branch": "main",
+}
+
+# Push payload fields shared by every push test
+_PUSH_BASE = MappingProxyType(
+    {
+        "before": "a" * 40,
+        "after": "b" * 40,
+        "repository": _REPOSITORY,
+        "pusher": {"name": "test-user", "email": "test@example.com"},
+        "sender": _PUSHER,
+        "compare": "https://github.com/test-org/test-repo/compare/aaa...bbb",
+    }
+)
+
+_TEST_COMMIT = {
+    "id": "b" * 40,
+    "message": "Test commit",
+    "timestamp": "2025-01-01T12:00:00Z",
+    "url": "https://github.com/test-org/test-repo/commit/" + "b" * 40,
+    "author": {"name": "test-user", "email": "test@example.com"},
+    "added": ["file1.py"],
+    "modified": [],
+    "removed": [],
+}
+
+
+def _make_push_payload(
+    ref: str, commits: list[dict] | None = None, head_commit: dict | None = None
+) -> dict:
+    """Build a push webhook payload for the test repository.
+
+    Args:
+        ref: Git ref that was pushed (e.g. "refs/heads/main")
+        commits: Pushed commits (default: none)
+        head_commit: Head commit of the push, if any
+
+    Returns:
+        dict: Push webhook payload
+    """
+    return {
+        "ref": ref,
+        **_PUSH_BASE,
+        "commits": commits or [],
+        "head_commit": head_commit,
+    }
+
+
+def _make_pr_payload(action: str, merged: bool = False) -> dict:
+    """Build a pull request webhook payload for the test repository.
+
+    The PR was opened on 2025-01-01T10:00:00Z; a merged PR was merged two
+    hours later.
+
+    Args:
+        action: PR action (e.g. "opened", "closed")
+        merged: Whether the PR was merged
+
+    Returns:
+        dict: Pull request webhook payload
+    """
+    pr_url = "https://github.com/test-org/test-repo/pull/7"
+    return {
+        "action": action,
+        "number": 7,
+        "pull_request": {
+            "id": 3001,
+            "number": 7,
+            "state": "closed" if action == "closed" else "open",
+            "title": "Add metrics flow test",
+            "html_url": pr_url,
+            "diff_url": f"{pr_url}.diff",
+            "patch_url": f"{pr_url}.patch",
+            "created_at": "2025-01-01T10:00:00Z",
+            "updated_at": "2025-01-01T12:00:00Z",
+            "closed_at": "2025-01-01T12:00:00Z" if action == "closed" else None,
+            "merged_at": "2025-01-01T12:00:00Z" if merged else None,
+            "user": _PUSHER,
+            "head": {
+                "ref": "feature/metrics",
+                "sha": "c" * 40,
+                "user": _PUSHER,
+                "label": "test-user:feature/metrics",
+            },
+            "base": {
+                "ref": "main",
+                "sha": "d" * 40,
+                "user": _OWNER,
+                "label": "test-org:main",
+            },
+            "merged": merged,
+            "additions": 10,
+            "deletions": 2,
+            "changed_files": 1,
+        },
+        "repository": _REPOSITORY,
+        "sender": _PUSHER,
+    }
+
+
+@pytest.fixture(scope="module")
+def pr_opened_payload() -> dict:
+    """Pull request opened webhook payload; shared, so don't mutate it."""
+    return _make_pr_payload("opened")
+
+
+@pytest.fixture(scope="module")
+def pr_closed_merged_payload() -> dict:
+    """Merged pull request webhook payload; shared, so don't mutate it."""
+    return _make_pr_payload("closed", merged=True)
 
 
 class TestPRMetricsFlow:
     """Test PR webhook → metrics flow."""
 
-    @pytest.mark.asyncio
-    async def test_pr_opened_webhook_records_metric(self, client, pr_opened_payload):
+    def test_pr_opened_webhook_records_metric(self, client, pr_opened_payload):
         """Test that PR opened webhook records PR metric."""
         test_repo = pr_opened_payload["repository"]["full_name"]
-        initial_count = pr_total.labels(
-            repository=test_repo, action="opened", merged="false"
-        )._value.get()
+        counter = pr_total.labels(repository=test_repo, action="opened", merged="false")
+        initial_count = counter._value.get()
 
         # Send PR opened webhook
-        signature = self._create_signature(pr_opened_payload)
+        payload_bytes, signature = sign_payload(pr_opened_payload)
         headers = {
             "X-Hub-Signature-256": signature,
             "X-GitHub-Event": "pull_request",
             "X-GitHub-Delivery": "test-delivery-pr-opened",
         }
 
-        response = await client.post("/webhook/github", json=pr_opened_payload, headers=headers)
+        response = client.post("/webhook/github", content=payload_bytes, headers=headers)
         assert response.status_code == 200
 
         # Verify metric was recorded
-        new_count = pr_total.labels(
-            repository=test_repo, action="opened", merged="false"
-        )._value.get()
+        new_count = counter._value.get()
         assert new_count == initial_count + 1
 
-    @pytest.mark.asyncio
-    async def test_pr_merged_webhook_records_review_time(
-        self, client, pr_closed_merged_payload
-    ):
+    def test_pr_merged_webhook_records_review_time(self, client, pr_closed_merged_payload):
         """Test that merged PR webhook records review time metric."""
         test_repo = pr_closed_merged_payload["repository"]["full_name"]
 
-        # Get initial histogram count
+        # Get initial histogram sum
         metric = pr_review_time_seconds.labels(repository=test_repo)
-        initial_count = metric._count.get()
+        initial_sum = metric._sum.get()
 
         # Send PR merged webhook
-        signature = self._create_signature(pr_closed_merged_payload)
+        payload_bytes, signature = sign_payload(pr_closed_merged_payload)
         headers = {
             "X-Hub-Signature-256": signature,
             "X-GitHub-Event": "pull_request",
             "X-GitHub-Delivery": "test-delivery-pr-merged",
         }
 
-        response = await client.post(
-            "/webhook/github", json=pr_closed_merged_payload, headers=headers
-        )
+        response = client.post("/webhook/github", content=payload_bytes, headers=headers)
         assert response.status_code == 200
 
-        # Verify review time metric was recorded
-        new_count = metric._count.get()
-        assert new_count == initial_count + 1
-        assert metric._sum.get() > 0  # Should have some time recorded
-
-    def _create_signature(self, payload: dict) -> str:
-        """Create HMAC signature for test payload."""
-        import json
-        from app.config import settings
-
-        payload_bytes = json.dumps(payload, separators=(",", ":")).encode("utf-8")
-        signature = hmac.new(
-            settings.github_webhook_secret.encode("utf-8"),
-            payload_bytes,
-            hashlib.sha256,
-        ).hexdigest()
-        return f"sha256={signature}"
+        # Verify review time was recorded (merged two hours after opening)
+        assert metric._sum.get() == initial_sum + 7200
 
 
 class TestDeploymentMetricsFlow:
     """Test push webhook → deployment metrics flow."""
 
-    @pytest.mark.asyncio
-    async def test_push_to_main_records_deployment(self, client):
+    def test_push_to_main_records_deployment(self, client):
         """Test that push to main branch records deployment metric."""
-        # Create push to main payload
-        push_payload = {
-            "ref": "refs/heads/main",
-            "before": "a" * 40,
-            "after": "b" * 40,
-            "repository": {
-                "full_name": "test-org/test-repo",
-                "name": "test-repo",
-                "owner": {"login": "test-org"},
-            },
-            "pusher": {"name": "test-user", "email": "test@example.com"},
-            "commits": [
-                {
-                    "id": "b" * 40,
-                    "message": "Test commit",
-                    "timestamp": "2025-01-01T12:00:00Z",
-                    "url": "https://github.com/test-org/test-repo/commit/" + "b" * 40,
-                    "author": {"name": "test-user", "email": "test@example.com"},
-                    "added": ["file1.py"],
-                    "modified": [],
-                    "removed": [],
-                }
-            ],
-            "head_commit": {
-                "id": "b" * 40,
-                "message": "Test commit",
-                "timestamp": "2025-01-01T12:00:00Z",
-                "url": "https://github.com/test-org/test-repo/commit/" + "b" * 40,
-                "author": {"name": "test-user", "email": "test@example.com"},
-                "added": ["file1.py"],
-                "modified": [],
-                "removed": [],
-            },
-            "compare": "https://github.com/test-org/test-repo/compare/aaa...bbb",
-        }
+        push_payload = _make_push_payload(
+            "refs/heads/main", commits=[_TEST_COMMIT], head_commit=_TEST_COMMIT
+        )
 
         test_repo = push_payload["repository"]["full_name"]
-        initial_count = deployments_total.labels(
+        counter = deployments_total.labels(
             repository=test_repo, environment="production", status="success"
-        )._value.get()
+        )
+        initial_count = counter._value.get()
 
         # Send push webhook
-        signature = self._create_signature(push_payload)
+        payload_bytes, signature = sign_payload(push_payload)
         headers = {
             "X-Hub-Signature-256": signature,
             "X-GitHub-Event": "push",
             "X-GitHub-Delivery": "test-delivery-push-main",
         }
 
-        response = await client.post("/webhook/github", json=push_payload, headers=headers)
+        response = client.post("/webhook/github", content=payload_bytes, headers=headers)
         assert response.status_code == 200
 
         # Verify deployment metric was recorded
-        new_count = deployments_total.labels(
-            repository=test_repo, environment="production", status="success"
-        )._value.get()
+        new_count = counter._value.get()
         assert new_count == initial_count + 1
 
-    @pytest.mark.asyncio
-    async def test_push_to_feature_branch_does_not_record_deployment(self, client):
+    def test_push_to_feature_branch_does_not_record_deployment(self, client):
         """Test that push to feature branch does NOT record deployment."""
-        push_payload = {
-            "ref": "refs/heads/feature/test-branch",
-            "before": "a" * 40,
-            "after": "b" * 40,
-            "repository": {
-                "full_name": "test-org/test-repo",
-                "name": "test-repo",
-                "owner": {"login": "test-org"},
-            },
-            "pusher": {"name": "test-user", "email": "test@example.com"},
-            "commits": [],
-            "head_commit": None,
-            "compare": "https://github.com/test-org/test-repo/compare/aaa...bbb",
-        }
+        push_payload = _make_push_payload("refs/heads/feature/test-branch")
 
         test_repo = push_payload["repository"]["full_name"]
-        initial_count = deployments_total.labels(
+        counter = deployments_total.labels(
             repository=test_repo, environment="production", status="success"
-        )._value.get()
+        )
+        initial_count = counter._value.get()
 
         # Send push webhook
-        signature = self._create_signature(push_payload)
+        payload_bytes, signature = sign_payload(push_payload)
         headers = {
             "X-Hub-Signature-256": signature,
             "X-GitHub-Event": "push",
             "X-GitHub-Delivery": "test-delivery-push-feature",
         }
 
-        response = await client.post("/webhook/github", json=push_payload, headers=headers)
+        response = client.post("/webhook/github", content=payload_bytes, headers=headers)
         assert response.status_code == 200
 
         # Verify NO deployment metric was recorded
-        new_count = deployments_total.labels(
-            repository=test_repo, environment="production", status="success"
-        )._value.get()
+        new_count = counter._value.get()
         assert new_count == initial_count  # Should not increment
 
-    def _create_signature(self, payload: dict) -> str:
-        """Create HMAC signature for test payload."""
-        import json
-        from app.config import settings
-
-        payload_bytes = json.dumps(payload, separators=(",", ":")).encode("utf-8")
-        signature = hmac.new(
-            settings.github_webhook_secret.encode("utf-8"),
-            payload_bytes,
-            hashlib.sha256,
-        ).hexdigest()
-        return f"sha256={signature}"
-
 
 class TestMetricsConfiguration:
     """Test that metrics respect configuration settings."""
 
-    @pytest.mark.asyncio
-    async def test_metrics_only_recorded_when_enabled(
-        self, client, pr_opened_payload, monkeypatch
-    ):
+    def test_metrics_only_recorded_when_enabled(self, client, pr_opened_payload, monkeypatch):
         """Test that metrics are only recorded when enabled in config."""
         # This test would need to modify settings and restart the app
         # For now, we assume metrics are controlled by settings.enable_metrics
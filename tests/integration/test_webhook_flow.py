@@ -4,78 +4,48 @@ These tests verify the entire webhook flow from GitHub delivery to processing,
 including signature verification, payload parsing, and response handling.
 """
 
-import hashlib
-import hmac
-import json
+import copy
 
 import pytest
 from fastapi.testclient import TestClient
 
-
-@pytest.fixture
-def client() -> TestClient:
-    """Create test client for integration tests."""
-    from app.main import app
-    return TestClient(app)
-
-
-@pytest.fixture
-def github_webhook_secret() -> str:
-    """Get GitHub webhook secret from settings."""
-    from app.config import settings
-    return settings.github_webhook_secret
-
-
-@pytest.fixture
-def sample_push_payload() -> dict:
-    """Sample push webhook payload."""
-    return {
-        "ref": "refs/heads/main",
-        "before": "a" * 40,
-        "after": "b" * 40,
-        "repository": {
-            "id": 987654321,
-            "name": "quality-agent",
-            "full_name": "silverbeer/quality-agent",
-            "html_url": "https://github.com/silverbeer/quality-agent",
-            "description": "AI-powered GitHub webhook service",
-            "private": False,
-            "owner": {
-                "login": "silverbeer",
-                "id": 12345,
-                "avatar_url": "https://avatars.githubusercontent.com/u/12345",
-                "html_url": "https://github.com/silverbeer",
-                "type": "User",
-            },
-            "default_branch": "main",
-        },
-        "pusher": {
-            "name": "silverbeer",
-            "email": "test@example.com",
-        },
-        "sender": {
+from tests.helpers import dumps_payload, sign_payload
+
+
+# Push payload built once at import; fixtures hand out copies or the shared base
+_BASE_PUSH_PAYLOAD = {
+    "ref": "refs/heads/main",
+    "before": "a" * 40,
+    "after": "b" * 40,
+    "repository": {
+        "id": 987654321,
+        "name": "quality-agent",
+        "full_name": "silverbeer/quality-agent",
+        "html_url": "https://github.com/silverbeer/quality-agent",
+        "description": "AI-powered GitHub webhook service",
+        "private": False,
+        "owner": {
             "login": "silverbeer",
             "id": 12345,
             "avatar_url": "https://avatars.githubusercontent.com/u/12345",
             "html_url": "https://github.com/silverbeer",
             "type": "User",
         },
-        "commits": [
-            {
-                "id": "c" * 40,
-                "message": "Add new feature",
-                "timestamp": "2024-11-14T10:00:00Z",
-                "url": "https://github.com/silverbeer/quality-agent/commit/cccccccc",
-                "author": {
-                    "name": "silverbeer",
-                    "email": "test@example.com",
-                },
-                "added": ["new_file.py"],
-                "removed": [],
-                "modified": ["existing_file.py"],
-            }
-        ],
-        "head_commit": {
+        "default_branch": "main",
+    },
+    "pusher": {
+        "name": "silverbeer",
+        "email": "test@example.com",
+    },
+    "sender": {
+        "login": "silverbeer",
+        "id": 12345,
+        "avatar_url": "https://avatars.githubusercontent.com/u/12345",
+        "html_url": "https://github.com/silverbeer",
+        "type": "User",
+    },
+    "commits": [
+        {
             "id": "c" * 40,
             "message": "Add new feature",
             "timestamp": "2024-11-14T10:00:00Z",
@@ -87,31 +57,72 @@ def sample_push_payload() -> dict:
             "added": ["new_file.py"],
             "removed": [],
             "modified": ["existing_file.py"],
+        }
+    ],
+    "head_commit": {
+        "id": "c" * 40,
+        "message": "Add new feature",
+        "timestamp": "2024-11-14T10:00:00Z",
+        "url": "https://github.com/silverbeer/quality-agent/commit/cccccccc",
+        "author": {
+            "name": "silverbeer",
+            "email": "test@example.com",
         },
-        "compare": "https://github.com/silverbeer/quality-agent/compare/aaaa...bbbb",
-    }
+        "added": ["new_file.py"],
+        "removed": [],
+        "modified": ["existing_file.py"],
+    },
+    "compare": "https://github.com/silverbeer/quality-agent/compare/aaaa...bbbb",
+}
 
 
 @pytest.fixture
-def sample_pr_opened_payload() -> dict:
-    """Sample pull request opened webhook payload."""
-    return {
-        "action": "opened",
+def sample_push_payload() -> dict:
+    """Sample push webhook payload.
+
+    Returns a deep copy, so tests may mutate it freely.
+    """
+    return copy.deepcopy(_BASE_PUSH_PAYLOAD)
+
+
+@pytest.fixture(scope="module")
+def sample_push_payload_ro() -> dict:
+    """Sample push webhook payload.
+
+    Shared by all tests in the module and must not be mutated; use
+    sample_push_payload for a mutable copy.
+    """
+    return _BASE_PUSH_PAYLOAD
+
+
+# Pull request opened payload built once at import
+_BASE_PR_OPENED_PAYLOAD = {
+    "action": "opened",
+    "number": 456,
+    "pull_request": {
+        "id": 123456789,
         "number": 456,
-        "pull_request": {
-            "id": 123456789,
-            "number": 456,
-            "state": "open",
-            "title": "Add new feature for webhook testing",
-            "body": "This PR adds webhook integration testing",
-            "html_url": "https://github.com/silverbeer/quality-agent/pull/456",
-            "diff_url": "https://github.com/silverbeer/quality-agent/pull/456.diff",
-            "patch_url": "https://github.com/silverbeer/quality-agent/pull/456.patch",
-            "created_at": "2024-11-14T10:00:00Z",
-            "updated_at": "2024-11-14T10:00:00Z",
-            "closed_at": None,
-            "merged_at": None,
-            "merge_commit_sha": None,
+        "state": "open",
+        "title": "Add new feature for webhook testing",
+        "body": "This PR adds webhook integration testing",
+        "html_url": "https://github.com/silverbeer/quality-agent/pull/456",
+        "diff_url": "https://github.com/silverbeer/quality-agent/pull/456.diff",
+        "patch_url": "https://github.com/silverbeer/quality-agent/pull/456.patch",
+        "created_at": "2024-11-14T10:00:00Z",
+        "updated_at": "2024-11-14T10:00:00Z",
+        "closed_at": None,
+        "merged_at": None,
+        "merge_commit_sha": None,
+        "user": {
+            "login": "silverbeer",
+            "id": 12345,
+            "avatar_url": "https://avatars.githubusercontent.com/u/12345",
+            "html_url": "https://github.com/silverbeer",
+            "type": "User",
+        },
+        "head": {
+            "ref": "feature/webhook-integration",
+            "sha": "a1b2c3d4e5f6789012345678901234567890abcd",
             "user": {
                 "login": "silverbeer",
                 "id": 12345,
@@ -119,80 +130,70 @@ def sample_pr_opened_payload() -> dict:
                 "html_url": "https://github.com/silverbeer",
                 "type": "User",
             },
-            "head": {
-                "ref": "feature/webhook-integration",
-                "sha": "a1b2c3d4e5f6789012345678901234567890abcd",
-                "user": {
-                    "login": "silverbeer",
-                    "id": 12345,
-                    "avatar_url": "https://avatars.githubusercontent.com/u/12345",
-                    "html_url": "https://github.com/silverbeer",
-                    "type": "User",
-                },
-                "label": "silverbeer:feature/webhook-integration",
-            },
-            "base": {
-                "ref": "main",
-                "sha": "b2c3d4e5f6789012345678901234567890abcdef",
-                "user": {
-                    "login": "silverbeer",
-                    "id": 12345,
-                    "avatar_url": "https://avatars.githubusercontent.com/u/12345",
-                    "html_url": "https://github.com/silverbeer",
-                    "type": "User",
-                },
-                "label": "silverbeer:main",
-            },
-            "merged": False,
-            "mergeable": True,
-            "draft": False,
-            "additions": 125,
-            "deletions": 32,
-            "changed_files": 8,
+            "label": "silverbeer:feature/webhook-integration",
         },
-        "repository": {
-            "id": 987654321,
-            "name": "quality-agent",
-            "full_name": "silverbeer/quality-agent",
-            "html_url": "https://github.com/silverbeer/quality-agent",
-            "description": "AI-powered GitHub webhook service",
-            "private": False,
-            "owner": {
+        "base": {
+            "ref": "main",
+            "sha": "b2c3d4e5f6789012345678901234567890abcdef",
+            "user": {
                 "login": "silverbeer",
                 "id": 12345,
                 "avatar_url": "https://avatars.githubusercontent.com/u/12345",
                 "html_url": "https://github.com/silverbeer",
                 "type": "User",
             },
-            "default_branch": "main",
+            "label": "silverbeer:main",
         },
-        "sender": {
+        "merged": False,
+        "mergeable": True,
+        "draft": False,
+        "additions": 125,
+        "deletions": 32,
+        "changed_files": 8,
+    },
+    "repository": {
+        "id": 987654321,
+        "name": "quality-agent",
+        "full_name": "silverbeer/quality-agent",
+        "html_url": "https://github.com/silverbeer/quality-agent",
+        "description": "AI-powered GitHub webhook service",
+        "private": False,
+        "owner": {
             "login": "silverbeer",
             "id": 12345,
             "avatar_url": "https://avatars.githubusercontent.com/u/12345",
             "html_url": "https://github.com/silverbeer",
             "type": "User",
         },
-    }
+        "default_branch": "main",
+    },
+    "sender": {
+        "login": "silverbeer",
+        "id": 12345,
+        "avatar_url": "https://avatars.githubusercontent.com/u/12345",
+        "html_url": "https://github.com/silverbeer",
+        "type": "User",
+    },
+}
+
+
+@pytest.fixture
+def sample_pr_opened_payload() -> dict:
+    """Sample pull request opened webhook payload.
 
+    Returns a deep copy, so tests may mutate it freely.
+    """
+    return copy.deepcopy(_BASE_PR_OPENED_PAYLOAD)
 
-def compute_github_signature(payload: dict, secret: str) -> str:
-    """Compute GitHub HMAC SHA-256 signature for payload.
 
-    Args:
-        payload: Webhook payload dictionary
-        secret: Webhook secret
+@pytest.fixture(scope="module")
+def sample_pr_opened_payload_ro() -> dict:
+    """Sample pull request opened webhook payload.
 
-    Returns:
-        str: Signature header value (sha256=<hash>)
+    Shared by all tests in the module and must not be mutated; use
+    sample_pr_opened_payload for a mutable copy.
     """
-    payload_bytes = json.dumps(payload, separators=(',', ':')).encode('utf-8')
-    signature = hmac.new(
-        key=secret.encode("utf-8"),
-        msg=payload_bytes,
-        digestmod=hashlib.sha256,
-    ).hexdigest()
-    return f"sha256={signature}"
+    return _BASE_PR_OPENED_PAYLOAD
 
 
 class TestWebhookIntegrationFlow:
@@ -201,12 +202,11 @@ class TestWebhookIntegrationFlow:
     def test_full_webhook_flow_pr_opened(
         self,
         client: TestClient,
-        github_webhook_secret: str,
-        sample_pr_opened_payload: dict,
+        sample_pr_opened_payload_ro: dict,
     ) -> None:
         """Test complete flow: PR opened → signature verification → processing."""
         # Arrange
-        signature = compute_github_signature(sample_pr_opened_payload, github_webhook_secret)
+        payload_bytes, signature = sign_payload(sample_pr_opened_payload_ro)
         headers = {
             "X-Hub-Signature-256": signature,
             "X-GitHub-Event": "pull_request",
@@ -217,7 +217,7 @@ class TestWebhookIntegrationFlow:
         # Act
         response = client.post(
             "/webhook/github",
-            json=sample_pr_opened_payload,
+            content=payload_bytes,
             headers=headers,
         )
 
@@ -234,13 +234,12 @@ class TestWebhookIntegrationFlow:
     def test_full_webhook_flow_pr_synchronized(
         self,
         client: TestClient,
-        github_webhook_secret: str,
         sample_pr_opened_payload: dict,
     ) -> None:
         """Test complete flow: PR synchronized (updated) → processing."""
         # Arrange - modify payload for synchronize action
         sample_pr_opened_payload["action"] = "synchronize"
-        signature = compute_github_signature(sample_pr_opened_payload, github_webhook_secret)
+        payload_bytes, signature = sign_payload(sample_pr_opened_payload)
         headers = {
             "X-Hub-Signature-256": signature,
             "X-GitHub-Event": "pull_request",
@@ -251,7 +250,7 @@ class TestWebhookIntegrationFlow:
         # Act
         response = client.post(
             "/webhook/github",
-            json=sample_pr_opened_payload,
+            content=payload_bytes,
             headers=headers,
         )
 
@@ -267,7 +266,6 @@ class TestWebhookIntegrationFlow:
     def test_full_webhook_flow_pr_closed_merged(
         self,
         client: TestClient,
-        github_webhook_secret: str,
         sample_pr_opened_payload: dict,
     ) -> None:
         """Test complete flow: PR closed (merged)."""
@@ -275,7 +273,7 @@ class TestWebhookIntegrationFlow:
         sample_pr_opened_payload["action"] = "closed"
         sample_pr_opened_payload["pull_request"]["merged"] = True
         sample_pr_opened_payload["pull_request"]["state"] = "closed"
-        signature = compute_github_signature(sample_pr_opened_payload, github_webhook_secret)
+        payload_bytes, signature = sign_payload(sample_pr_opened_payload)
         headers = {
             "X-Hub-Signature-256": signature,
             "X-GitHub-Event": "pull_request",
@@ -286,7 +284,7 @@ class TestWebhookIntegrationFlow:
         # Act
         response = client.post(
             "/webhook/github",
-            json=sample_pr_opened_payload,
+            content=payload_bytes,
             headers=headers,
         )
 
@@ -299,12 +297,11 @@ class TestWebhookIntegrationFlow:
     def test_full_webhook_flow_security_rejects_tampered_payload(
         self,
         client: TestClient,
-        github_webhook_secret: str,
         sample_pr_opened_payload: dict,
     ) -> None:
         """Test security: Reject tampered payload (signature mismatch)."""
         # Arrange - compute signature for original payload
-        signature = compute_github_signature(sample_pr_opened_payload, github_webhook_secret)
+        signature = sign_payload(sample_pr_opened_payload)[1]
 
         # Tamper with payload after signature
         sample_pr_opened_payload["number"] = 999  # Changed!
@@ -319,7 +316,7 @@ class TestWebhookIntegrationFlow:
         # Act
         response = client.post(
             "/webhook/github",
-            json=sample_pr_opened_payload,
+            content=dumps_payload(sample_pr_opened_payload),
             headers=headers,
         )
 
@@ -330,12 +327,11 @@ class TestWebhookIntegrationFlow:
     def test_full_webhook_flow_rejects_replay_attack(
         self,
         client: TestClient,
-        github_webhook_secret: str,
     ) -> None:
         """Test security: Signature from different payload doesn't work (replay attack)."""
         # Arrange - create signature for payload 1
         payload1 = {"action": "opened", "number": 1}
-        signature1 = compute_github_signature(payload1, github_webhook_secret)
+        signature1 = sign_payload(payload1)[1]
 
         # Try to use signature1 with different payload2
         payload2 = {"action": "opened", "number": 2}
@@ -350,7 +346,7 @@ class TestWebhookIntegrationFlow:
         # Act - send payload2 with signature1
         response = client.post(
             "/webhook/github",
-            json=payload2,
+            content=dumps_payload(payload2),
             headers=headers,
         )
 
@@ -360,13 +356,12 @@ class TestWebhookIntegrationFlow:
     def test_full_webhook_flow_handles_draft_pr(
         self,
         client: TestClient,
-        github_webhook_secret: str,
         sample_pr_opened_payload: dict,
     ) -> None:
         """Test that draft PRs are processed (they are actionable)."""
         # Arrange - mark as draft
         sample_pr_opened_payload["pull_request"]["draft"] = True
-        signature = compute_github_signature(sample_pr_opened_payload, github_webhook_secret)
+        payload_bytes, signature = sign_payload(sample_pr_opened_payload)
         headers = {
             "X-Hub-Signature-256": signature,
             "X-GitHub-Event": "pull_request",
@@ -377,7 +372,7 @@ class TestWebhookIntegrationFlow:
         # Act
         response = client.post(
             "/webhook/github",
-            json=sample_pr_opened_payload,
+            content=payload_bytes,
             headers=headers,
         )
 
@@ -393,13 +388,12 @@ class TestWebhookIntegrationFlow:
     def test_full_webhook_flow_ignores_labeled_action(
         self,
         client: TestClient,
-        github_webhook_secret: str,
         sample_pr_opened_payload: dict,
     ) -> None:
         """Test that non-actionable actions (labeled) are ignored."""
         # Arrange
         sample_pr_opened_payload["action"] = "labeled"
-        signature = compute_github_signature(sample_pr_opened_payload, github_webhook_secret)
+        payload_bytes, signature = sign_payload(sample_pr_opened_payload)
         headers = {
             "X-Hub-Signature-256": signature,
             "X-GitHub-Event": "pull_request",
@@ -410,7 +404,7 @@ class TestWebhookIntegrationFlow:
         # Act
         response = client.post(
             "/webhook/github",
-            json=sample_pr_opened_payload,
+            content=payload_bytes,
             headers=headers,
         )
 
@@ -427,12 +421,11 @@ class TestWebhookErrorHandling:
     def test_webhook_handles_malformed_payload_gracefully(
         self,
         client: TestClient,
-        github_webhook_secret: str,
     ) -> None:
         """Test that malformed payloads return 400 with helpful error."""
         # Arrange - payload missing required fields
         malformed_payload = {"action": "opened"}  # Missing number, pull_request, etc.
-        signature = compute_github_signature(malformed_payload, github_webhook_secret)
+        payload_bytes, signature = sign_payload(malformed_payload)
         headers = {
             "X-Hub-Signature-256": signature,
             "X-GitHub-Event": "pull_request",
@@ -443,7 +436,7 @@ class TestWebhookErrorHandling:
         # Act
         response = client.post(
             "/webhook/github",
-            json=malformed_payload,
+            content=payload_bytes,
             headers=headers,
         )
 
@@ -454,13 +447,12 @@ class TestWebhookErrorHandling:
     def test_webhook_validates_sha_format(
         self,
         client: TestClient,
-        github_webhook_secret: str,
         sample_pr_opened_payload: dict,
     ) -> None:
         """Test that invalid SHA format is rejected."""
         # Arrange - invalid SHA (not 40 characters)
         sample_pr_opened_payload["pull_request"]["head"]["sha"] = "invalid"
-        signature = compute_github_signature(sample_pr_opened_payload, github_webhook_secret)
+        payload_bytes, signature = sign_payload(sample_pr_opened_payload)
         headers = {
             "X-Hub-Signature-256": signature,
             "X-GitHub-Event": "pull_request",
@@ -471,7 +463,7 @@ class TestWebhookErrorHandling:
         # Act
         response = client.post(
             "/webhook/github",
-            json=sample_pr_opened_payload,
+            content=payload_bytes,
             headers=headers,
         )
 
@@ -486,12 +478,11 @@ class TestPushEventHandling:
     def test_push_event_accepted(
         self,
         client: TestClient,
-        github_webhook_secret: str,
-        sample_push_payload: dict,
+        sample_push_payload_ro: dict,
     ) -> None:
         """Test that push events are accepted and processed."""
         # Arrange
-        signature = compute_github_signature(sample_push_payload, github_webhook_secret)
+        payload_bytes, signature = sign_payload(sample_push_payload_ro)
         headers = {
             "X-Hub-Signature-256": signature,
             "X-GitHub-Event": "push",
@@ -502,7 +493,7 @@ class TestPushEventHandling:
         # Act
         response = client.post(
             "/webhook/github",
-            json=sample_push_payload,
+            content=payload_bytes,
             headers=headers,
         )
 
@@ -517,7 +508,6 @@ class TestPushEventHandling:
     def test_push_event_with_multiple_commits(
         self,
         client: TestClient,
-        github_webhook_secret: str,
         sample_push_payload: dict,
     ) -> None:
         """Test push event with multiple commits."""
@@ -535,7 +525,7 @@ class TestPushEventHandling:
             "removed": [],
             "modified": ["another_file.py"],
         })
-        signature = compute_github_signature(sample_push_payload, github_webhook_secret)
+        payload_bytes, signature = sign_payload(sample_push_payload)
         headers = {
             "X-Hub-Signature-256": signature,
             "X-GitHub-Event": "push",
@@ -546,7 +536,7 @@ class TestPushEventHandling:
         # Act
         response = client.post(
             "/webhook/github",
-            json=sample_push_payload,
+            content=payload_bytes,
             headers=headers,
         )
 
@@ -558,13 +548,12 @@ class TestPushEventHandling:
     def test_push_event_ignores_tag_push(
         self,
         client: TestClient,
-        github_webhook_secret: str,
         sample_push_payload: dict,
     ) -> None:
         """Test that tag pushes are ignored."""
         # Arrange - change to tag ref
         sample_push_payload["ref"] = "refs/tags/v1.0.0"
-        signature = compute_github_signature(sample_push_payload, github_webhook_secret)
+        payload_bytes, signature = sign_payload(sample_push_payload)
         headers = {
             "X-Hub-Signature-256": signature,
             "X-GitHub-Event": "push",
@@ -575,7 +564,7 @@ class TestPushEventHandling:
         # Act
         response = client.post(
             "/webhook/github",
-            json=sample_push_payload,
+            content=payload_bytes,
             headers=headers,
         )
 
@@ -588,8 +577,7 @@ class TestPushEventHandling:
     def test_push_event_requires_valid_signature(
         self,
         client: TestClient,
-        github_webhook_secret: str,
-        sample_push_payload: dict,
+        sample_push_payload_ro: dict,
     ) -> None:
         """Test that push events also require signature verification."""
         # Arrange - invalid signature
@@ -603,7 +591,7 @@ class TestPushEventHandling:
         # Act
         response = client.post(
             "/webhook/github",
-            json=sample_push_payload,
+            content=dumps_payload(sample_push_payload_ro),
             headers=headers,
         )
 
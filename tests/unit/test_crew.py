@@ -0,0 +1,90 @@
+"""Unit tests for the quality analysis crew.
+
+Tests parsing of agent output into analysis models.
+"""
+
+import json
+
+import pytest
+
+from agents.crew import QualityAnalysisCrew
+from models.analysis import CodeChange
+
+
+@pytest.fixture
+def crew() -> QualityAnalysisCrew:
+    """Crew instance without agents; the parsers don't touch the LLM."""
+    return QualityAnalysisCrew.__new__(QualityAnalysisCrew)
+
+
+class TestParseCodeChanges:
+    """Test parsing CodeAnalyzerAgent output into CodeChange models."""
+
+    def test_valid_json_list_is_parsed(self, crew):
+        """Test that a JSON array of code changes is validated as-is."""
+        # Arrange
+        changes = [
+            {
+                "file_path": "app/main.py",
+                "change_type": "modified",
+                "file_type": "source",
+                "functions_changed": ["health"],
+                "lines_added": 3,
+                "lines_deleted": 1,
+                "complexity_impact": "low",
+            },
+            {
+                "file_path": "tests/unit/test_main.py",
+                "change_type": "added",
+                "file_type": "test",
+                "lines_added": 20,
+                "lines_deleted": 0,
+                "complexity_impact": "low",
+            },
+        ]
+
+        # Act
+        result = crew._parse_code_changes(json.dumps(changes))
+
+        # Assert
+        assert [change.file_path for change in result] == [
+            "app/main.py",
+            "tests/unit/test_main.py",
+        ]
+        assert result[0].functions_changed == ["health"]
+        assert result[1].is_test_file
+
+    def test_non_string_result_is_stringified(self, crew):
+        """Test that crew output objects are parsed via their string form."""
+
+        # Arrange
+        class CrewOutput:
+            def __str__(self) -> str:
+                return "[]"
+
+        # Act
+        result = crew._parse_code_changes(CrewOutput())
+
+        # Assert
+        assert result == []
+
+    def test_invalid_json_falls_back_to_mock_data(self, crew):
+        """Test that free-form agent output falls back to mock code changes."""
+        # Act
+        result = crew._parse_code_changes("The PR modifies the user service.")
+
+        # Assert
+        assert result
+        assert all(isinstance(change, CodeChange) for change in result)
+        assert result[0].file_path == "app/services/user.py"
+
+    def test_schema_mismatch_falls_back_to_mock_data(self, crew):
+        """Test that valid JSON not matching the schema falls back to mock data."""
+        # Arrange - missing required fields and an unknown complexity level
+        changes = [{"file_path": "app/main.py", "complexity_impact": "extreme"}]
+
+        # Act
+        result = crew._parse_code_changes(json.dumps(changes))
+
+        # Assert
+        assert result[0].file_path == "app/services/user.py"
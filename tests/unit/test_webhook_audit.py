@@ -2,7 +2,10 @@
 
 import json
 import tempfile
-from datetime import datetime, timedelta
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
 from pathlib import Path
 
 import pytest
@@ -22,7 +25,9 @@ class TestWebhookAuditor:
     @pytest.fixture
     def auditor(self, temp_audit_dir: Path) -> WebhookAuditor:
         """Create a WebhookAuditor instance for testing."""
-        return WebhookAuditor(audit_dir=str(temp_audit_dir), retention_days=7)
+        auditor = WebhookAuditor(audit_dir=str(temp_audit_dir), retention_days=7)
+        yield auditor
+        auditor.close()
 
     def test_auditor_initializes_directory(self, temp_audit_dir: Path) -> None:
         """Test that auditor creates the audit directory on initialization."""
@@ -76,6 +81,113 @@ class TestWebhookAuditor:
             assert data["metadata"] == metadata
             assert "timestamp" in data
 
+    def test_log_webhook_request_writes_raw_body_verbatim(
+        self, auditor: WebhookAuditor
+    ) -> None:
+        """Test that a raw JSON body is stored without being re-serialized."""
+        # Arrange
+        raw_body = b'{"ref":"refs/heads/main","commits":[]}'
+
+        # Act
+        auditor.log_webhook_request("test-delivery-raw", "push", {}, raw_body)
+
+        # Assert
+        line = auditor._get_log_file().read_text().splitlines()[0]
+        assert line.endswith(f', "payload": {raw_body.decode()}}}')
+        assert json.loads(line)["payload"] == {"ref": "refs/heads/main", "commits": []}
+
+    def test_log_webhook_request_reencodes_multiline_raw_body(
+        self, auditor: WebhookAuditor
+    ) -> None:
+        """Test that a pretty-printed body still produces a single JSONL line."""
+        # Arrange
+        raw_body = b'{\n  "ref": "refs/heads/main"\n}'
+
+        # Act
+        auditor.log_webhook_request("test-delivery-multiline", "push", {}, raw_body)
+
+        # Assert
+        lines = auditor._get_log_file().read_text().splitlines()
+        assert len(lines) == 1
+        assert json.loads(lines[0])["payload"] == {"ref": "refs/heads/main"}
+
+    def test_log_webhook_request_reencodes_raw_body_with_bare_cr(
+        self, auditor: WebhookAuditor
+    ) -> None:
+        """Test that a bare carriage return in a raw body doesn't split the line."""
+        # Arrange
+        raw_body = b'{\r"ref": "refs/heads/main"}'
+
+        # Act
+        auditor.log_webhook_request("test-delivery-cr", "push", {}, raw_body)
+
+        # Assert
+        lines = auditor._get_log_file().read_text().splitlines()
+        assert len(lines) == 1
+        assert json.loads(lines[0])["payload"] == {"ref": "refs/heads/main"}
+
+    def test_log_webhook_request_reencodes_raw_body_with_nan(
+        self, auditor: WebhookAuditor
+    ) -> None:
+        """Test that NaN/Infinity in a raw body are logged as null and read back."""
+        # Arrange
+        raw_body = b'{"x":NaN,"y":-Infinity,"z":1}'
+
+        # Act
+        auditor.log_webhook_request("test-delivery-nan", "push", {}, raw_body)
+
+        # Assert
+        entries = auditor.read_audit_logs()
+        assert [entry["payload"] for entry in entries] == [{"x": None, "y": None, "z": 1}]
+
+    def test_log_webhook_request_normalizes_aware_received_at(
+        self, auditor: WebhookAuditor
+    ) -> None:
+        """Test that a timezone-aware receive time is logged as naive UTC."""
+        # Arrange - 2025-11-15T01:30:45 UTC
+        received_at = datetime(2025, 11, 14, 20, 30, 45, tzinfo=timezone(timedelta(hours=-5)))
+
+        # Act
+        auditor.log_webhook_request("test-delivery-aware", "push", {}, {}, None, received_at)
+
+        # Assert
+        log_file = auditor.audit_dir / "webhooks-2025-11-15.jsonl"
+        data = json.loads(log_file.read_text())
+        assert data["timestamp"] == "2025-11-15T01:30:45Z"
+
+    def test_log_webhook_request_uses_received_at(self, auditor: WebhookAuditor) -> None:
+        """Test that a caller-supplied receive time sets the timestamp and file."""
+        # Arrange
+        received_at = datetime(2025, 11, 15, 1, 30, 45, 123456)
+
+        # Act
+        auditor.log_webhook_request("test-delivery-ts", "push", {}, {}, None, received_at)
+
+        # Assert
+        log_file = auditor.audit_dir / "webhooks-2025-11-15.jsonl"
+        data = json.loads(log_file.read_text())
+        assert data["timestamp"] == "2025-11-15T01:30:45.123456Z"
+
+    def test_log_webhook_request_switches_file_on_new_day(
+        self, auditor: WebhookAuditor
+    ) -> None:
+        """Test that the open log handle moves to the new file when the date changes."""
+        # Arrange
+        first_day = datetime(2025, 11, 15, 23, 59, 59)
+        second_day = datetime(2025, 11, 16, 0, 0, 1)
+
+        # Act
+        auditor.log_webhook_request("day-1", "push", {}, {}, None, first_day)
+        first_handle = auditor._handle[1]
+        auditor.log_webhook_request("day-2", "push", {}, {}, None, second_day)
+
+        # Assert
+        assert first_handle.closed
+        first = json.loads((auditor.audit_dir / "webhooks-2025-11-15.jsonl").read_text())
+        second = json.loads((auditor.audit_dir / "webhooks-2025-11-16.jsonl").read_text())
+        assert first["delivery_id"] == "day-1"
+        assert second["delivery_id"] == "day-2"
+
     def test_log_webhook_request_appends_to_existing_file(
         self, auditor: WebhookAuditor
     ) -> None:
@@ -125,6 +237,31 @@ class TestWebhookAuditor:
         assert entries[0]["delivery_id"] == "test-1"
         assert entries[1]["delivery_id"] == "test-2"
 
+    def test_read_audit_logs_skips_invalid_lines(self, auditor: WebhookAuditor) -> None:
+        """Test that malformed lines are skipped instead of aborting the read."""
+        # Arrange - a truncated entry and a non-UTF-8 line between valid ones
+        auditor.log_webhook_request(
+            delivery_id="test-1",
+            event_type="pull_request",
+            headers={},
+            payload={"number": 1},
+        )
+        with auditor._get_log_file().open("ab") as f:
+            f.write(b'{"delivery_id": "truncated", "payl\n')
+            f.write(b'{"delivery_id": "\xff\xfe"}\n')
+        auditor.log_webhook_request(
+            delivery_id="test-2",
+            event_type="pull_request",
+            headers={},
+            payload={"number": 2},
+        )
+
+        # Act
+        entries = auditor.read_audit_logs()
+
+        # Assert
+        assert [entry["delivery_id"] for entry in entries] == ["test-1", "test-2"]
+
     def test_read_audit_logs_for_missing_date(self, auditor: WebhookAuditor) -> None:
         """Test reading audit logs for a date with no logs."""
         # Arrange
@@ -252,14 +389,39 @@ class TestConvenienceFunctions:
         # Assert
         assert auditor1 is auditor2
 
-    def test_log_webhook_uses_global_auditor(self, tmp_path: Path) -> None:
-        """Test that log_webhook uses the global auditor instance."""
-        # Arrange
-        import app.webhook_audit
+    def test_get_auditor_concurrent_first_calls_share_instance(self, monkeypatch) -> None:
+        """Test that concurrent first calls to get_auditor create one auditor."""
+        # Arrange - no global auditor yet, and a slow constructor to widen the race
+        created: list[WebhookAuditor] = []
 
-        # Create and set a test auditor
+        class SlowAuditor(WebhookAuditor):
+            def __init__(self) -> None:
+                time.sleep(0.01)
+                super().__init__()
+                created.append(self)
+
+        monkeypatch.setattr("app.webhook_audit._auditor", None)
+        monkeypatch.setattr("app.webhook_audit.WebhookAuditor", SlowAuditor)
+        barrier = threading.Barrier(8)
+
+        def _get() -> WebhookAuditor:
+            barrier.wait()
+            return get_auditor()
+
+        # Act
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            auditors = list(pool.map(lambda _: _get(), range(8)))
+
+        # Assert
+        assert len(created) == 1
+        assert all(auditor is created[0] for auditor in auditors)
+        created[0].close()
+
+    def test_log_webhook_uses_global_auditor(self, tmp_path: Path, monkeypatch) -> None:
+        """Test that log_webhook uses the global auditor instance."""
+        # Arrange - swap in a test auditor, restoring the app's afterwards
         test_auditor = WebhookAuditor(audit_dir=str(tmp_path), retention_days=7)
-        app.webhook_audit._auditor = test_auditor
+        monkeypatch.setattr("app.webhook_audit._auditor", test_auditor)
 
         # Act
         log_webhook(
@@ -273,17 +435,15 @@ class TestConvenienceFunctions:
         # Assert
         log_files = list(tmp_path.glob("webhooks-*.jsonl"))
         assert len(log_files) == 1
+        test_auditor.close()
 
     def test_cleanup_old_audit_logs_uses_global_auditor(
-        self, tmp_path: Path
+        self, tmp_path: Path, monkeypatch
     ) -> None:
         """Test that cleanup_old_audit_logs uses the global auditor."""
-        # Arrange
-        import app.webhook_audit
-
-        # Create and set a test auditor
+        # Arrange - swap in a test auditor, restoring the app's afterwards
         test_auditor = WebhookAuditor(audit_dir=str(tmp_path), retention_days=7)
-        app.webhook_audit._auditor = test_auditor
+        monkeypatch.setattr("app.webhook_audit._auditor", test_auditor)
 
         # Create an old log file
         old_date = datetime.utcnow().date() - timedelta(days=10)
@@ -344,3 +504,4 @@ class TestIntegration:
         # Verify log still exists
         entries_after_cleanup = auditor.read_audit_logs()
         assert len(entries_after_cleanup) == 1
+        auditor.close()
@@ -55,6 +55,23 @@ class TestSignatureVerification:
         # Assert
         assert result is False
 
+    def test_verify_github_signature_with_non_hex_signature(self) -> None:
+        """Test that a full-length but non-hex signature is rejected."""
+        # Arrange
+        secret = "test_secret_12345"
+        payload = b'{"test": "data"}'
+        signature_header = "sha256=" + "z" * 64
+
+        # Act
+        result = verify_github_signature(
+            payload_body=payload,
+            signature_header=signature_header,
+            secret=secret,
+        )
+
+        # Assert
+        assert result is False
+
     def test_verify_github_signature_with_wrong_secret(self) -> None:
         """Test that signatures with wrong secret are rejected."""
         # Arrange